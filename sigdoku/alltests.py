@@ -2,8 +2,14 @@
 # -*- coding: utf-8 -*-
 import unittest
 
+from test_batch import *
 from test_console import *
+from test_memory import *
+from test_sat import *
+from test_search import *
 from test_sudoku import *
+from test_tables import *
+from test_verify import *
 
 unittest.main()
 
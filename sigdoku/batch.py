@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+import sudoku
+import search
+from console import Console
+
+
+def parse_puzzle(line):
+    """
+    The (root, moves) of a puzzle written as its cell values row by row, with
+    the console characters for values above 9 and 0 or . for the empty cells
+    """
+    puzzle = line.strip().replace('.', '0').upper()
+    size = int(round(len(puzzle)**0.5))
+    root = int(round(size**0.5))
+    if size**2 != len(puzzle) or root**2 != size:
+        raise sudoku.OutOfRangeException('Not a puzzle: %s' % line.strip())
+    return (root, search.value_moves(size, [Console.CELL_CHARS.index(c) for c in puzzle]))
+    
+    
+
+class BatchRunner(object):
+    """
+    Solve a corpus file with one puzzle per line, appending one line per 
+    puzzle to the output file: the solution, - if there is none, or ! if the
+    line is not a valid puzzle.
+    If checkpoint_path is given, the corpus position and the output size are
+    saved there at most every checkpoint_every seconds, and 
+    BatchRunner.resume continues from them
+    """
+    NO_SOLUTION = '-'
+    INVALID = '!'
+    
+    def __init__(self, corpus_path, output_path, checkpoint_path=None, checkpoint_every=60, 
+                 solvers=sudoku.ALL_SOLVERS):
+        self.corpus_path = corpus_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.solvers = solvers
+        self.checkpoints = 0
+        # Puzzles done, and where the next one starts in the corpus
+        self.offset = 0
+        self.position = 0
+        # Bytes of output written for the puzzles done
+        self.output_size = 0
+        # One board per root, reused for all the puzzles
+        self.__boards = {}
+        
+        
+    @classmethod
+    def resume(cls, checkpoint_path, checkpoint_every=60, solvers=sudoku.ALL_SOLVERS):
+        with open(checkpoint_path, 'r') as f:
+            data = json.load(f)
+        runner = cls(data['corpus'], data['output'], checkpoint_path, checkpoint_every, solvers)
+        runner.offset = data['offset']
+        runner.position = data['position']
+        runner.output_size = data['output_size']
+        return runner
+        
+        
+    def state(self):
+        return {
+            'corpus': self.corpus_path,
+            'output': self.output_path,
+            'offset': self.offset,
+            'position': self.position,
+            'output_size': self.output_size,
+        }
+        
+        
+    def checkpoint(self):
+        search.write_checkpoint(self.checkpoint_path, self.state())
+        self.checkpoints += 1
+        
+        
+    def solve(self, root, moves):
+        """
+        The solution of a puzzle as a line of the output file
+        """
+        board = self.__boards.get(root)
+        if board is None:
+            board = self.__boards[root] = sudoku.Board(root, self.solvers)
+        board.load(moves)
+        if not board.solve():
+            solutions = search.Search(board).run()
+            if not solutions:
+                return BatchRunner.NO_SOLUTION
+            board.fill(solutions[0])
+        return ''.join(Console.CELL_CHARS[cell.value] for cell in board.cells)
+        
+        
+    def run(self, max_puzzles=None):
+        """
+        Solve the puzzles from the current offset to the end of the corpus, or
+        max_puzzles of them; return the number of puzzles solved
+        """
+        done = 0
+        last_checkpoint = time.time()
+        mode = 'r+' if os.path.exists(self.output_path) else 'w'
+        with open(self.corpus_path, 'r') as corpus, open(self.output_path, mode) as output:
+            # Drop what was written after the last checkpoint
+            output.truncate(self.output_size)
+            output.seek(self.output_size)
+            corpus.seek(self.position)
+            while max_puzzles is None or done < max_puzzles:
+                line = corpus.readline()
+                if not line:
+                    break
+                if line.strip():
+                    try:
+                        result = self.solve(*parse_puzzle(line))
+                    except (sudoku.SudokuException, ValueError):
+                        # Conflicting clues, unknown characters or a wrong length
+                        result = BatchRunner.INVALID
+                    output.write(result + '\n')
+                    self.offset += 1
+                    done += 1
+                self.position = corpus.tell()
+                self.output_size = output.tell()
+                if self.checkpoint_path is not None and time.time() - last_checkpoint >= self.checkpoint_every:
+                    output.flush()
+                    self.checkpoint()
+                    last_checkpoint = time.time()
+            output.flush()
+        if self.checkpoint_path is not None:
+            self.checkpoint()
+        return done
@@ -0,0 +1,92 @@
+#! /usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Timings of the solving backends on hard puzzles; run with:
+
+python benchmarks.py
+"""
+import time
+
+import search
+import sat
+import tables
+import puzzles
+
+
+# (name, puzzle) with the cell values row by row, 0 for the empty cells.
+# Board.solve() gets stuck on Inkala and on the 16x16 puzzles, the other two
+# need the chain solvers
+HARD_PUZZLES = [
+    ('9x9 Inkala', puzzles.INKALA),
+    ('9x9 simple coloring', puzzles.SIMPLE_COLORING),
+    ('9x9 xy-chain', puzzles.XY_CHAIN),
+    ('16x16 101 clues', puzzles.HARD_16[0]),
+    ('16x16 104 clues', puzzles.HARD_16[1]),
+]
+
+# Puzzles that Board.solve() can finish, for the table lookups
+TABLE_PUZZLES = [
+    ('4x4', '1200301000030321'),
+    ('9x9 README', puzzles.README),
+    ('9x9 simple coloring', puzzles.SIMPLE_COLORING),
+    ('9x9 xy-chain', puzzles.XY_CHAIN),
+]
+
+
+def search_backend(board):
+    return search.Search(board, 1).run()
+    
+    
+def sat_backend(board):
+    return sat.solutions(board, 1)
+    
+    
+def solve_backend(board):
+    return [board.values()] if board.solve() else []
+    
+    
+def tables_backend(board):
+    return tables.solutions(board, 1)
+    
+    
+BACKENDS = [
+    ('search', search_backend),
+    ('sat', sat_backend),
+]
+
+TABLE_BACKENDS = [
+    ('solve', solve_backend),
+    ('tables', tables_backend),
+]
+
+
+def timed(backend, puzzle, repeat):
+    """
+    Best time in seconds over repeat runs, each on a new board
+    """
+    best = None
+    for i in range(repeat):
+        board = puzzles.board(puzzle)
+        start = time.time()
+        solutions = backend(board)
+        elapsed = time.time() - start
+        if len(solutions) != 1:
+            raise Exception('Expected one solution, found %d' % len(solutions))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+    
+    
+def run(puzzles=HARD_PUZZLES, backends=BACKENDS, repeat=3):
+    print 'puzzle'.ljust(24) + ''.join(name.rjust(12) for (name, backend) in backends)
+    for (name, puzzle) in puzzles:
+        times = [timed(backend, puzzle, repeat) for (backend_name, backend) in backends]
+        print name.ljust(24) + ''.join(('%.4fs' % t).rjust(12) for t in times)
+        
+        
+if __name__ == '__main__':
+    run()
+    print
+    # Build the tables before timing the lookups
+    tables.grids_2()
+    tables.templates_3()
+    run(TABLE_PUZZLES, TABLE_BACKENDS)
@@ -1,13 +1,120 @@
 # -*- coding: utf-8 -*-
 
 import sudoku
+import itertools
 import json
+import threading
+import time
+import Queue
+
+
+
+class Speculator(object):
+    """
+    Computes in a worker thread the next hint, the candidates of the empty 
+    cells and the solution of a board state while the console waits for input.
+    Results are keyed by (root, state hash) and dropped when another state is
+    submitted
+    """
+    HINT = 'hint'
+    CANDIDATES = 'candidates'
+    SOLUTION = 'solution'
+    
+    def __init__(self, solvers=sudoku.ALL_SOLVERS):
+        self.solvers = solvers
+        self.hits = 0
+        self.__key = None
+        self.__results = {}
+        self.__ready = threading.Condition()
+        self.__queue = Queue.Queue()
+        self.__thread = threading.Thread(target=self.__work)
+        self.__thread.daemon = True
+        self.__thread.start()
+        
+        
+    @staticmethod
+    def key(board):
+        return (board.dimensions.root, board.state_hash)
+        
+        
+    def submit(self, board):
+        """
+        Start working on the current state of board, unless already done
+        """
+        key = Speculator.key(board)
+        with self.__ready:
+            if key == self.__key:
+                return
+            self.__key = key
+            self.__results = {}
+        self.__queue.put((key, board.freeze()))
         
+        
+    def result(self, board, kind, timeout=0):
+        """
+        The result of the given kind for the current state of board, waiting
+        at most timeout seconds for it; None if it is not available
+        """
+        key = Speculator.key(board)
+        deadline = time.time() + timeout
+        with self.__ready:
+            while key == self.__key and kind not in self.__results and time.time() < deadline:
+                self.__ready.wait(deadline - time.time())
+            if key != self.__key or kind not in self.__results:
+                return None
+            self.hits += 1
+            return self.__results[kind]
+            
+            
+    def stop(self):
+        # No state is wanted anymore, so a solve in progress stops too
+        with self.__ready:
+            self.__key = None
+            self.__results = {}
+        self.__queue.put(None)
+        self.__thread.join()
+        
+        
+    def __work(self):
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                return
+            (key, frozen) = item
+            if key != self.__key:
+                # Another state was submitted since
+                continue
+            board = frozen.to_board(self.solvers)
+            (cell, value) = board.find_move()
+            if not self.__store(key, Speculator.HINT, None if cell is None else (cell.row, cell.col, value)):
+                continue
+            candidates = dict(((cell.row, cell.col), cam) for (cell, cam) in board.allowed_moves_for_cells().items())
+            if not self.__store(key, Speculator.CANDIDATES, candidates):
+                continue
+            steps = board.solve_steps()
+            for step in steps:
+                if key != self.__key:
+                    break
+            steps.close()
+            self.__store(key, Speculator.SOLUTION, board.values())
+            
+            
+    def __store(self, key, kind, result):
+        # False if the state is no longer wanted
+        with self.__ready:
+            if key != self.__key:
+                return False
+            self.__results[kind] = result
+            self.__ready.notify_all()
+            return True
+            
+            
+            
 class Console(object):
     
     CELL_CHARS = '0123456789ABCDEFG'
     
-    def __init__(self, root):
+    def __init__(self, root, speculate=False):
         self.solvers = sudoku.ALL_SOLVERS # config
         self.new_board(root)
         self.do_play = True
@@ -15,6 +122,7 @@ class Console(object):
         self.render_separators = True
         self.cell_width = 3
         self.vertical_separator = '|'
+        self.speculator = Speculator(self.solvers) if speculate else None
         
 
     def play(self):
@@ -22,7 +130,24 @@ class Console(object):
             self.draw()
             self.check_finished()
             self.report_and_clear_error()
+            self.speculate()
             self.get_command_and_execute()
+        if self.speculator is not None:
+            self.speculator.stop()
+
+
+    def speculate(self):
+        """
+        Let the speculator work on the current board, if speculation is on
+        """
+        if self.speculator is not None:
+            self.speculator.submit(self.board)
+
+
+    def speculated(self, kind):
+        if self.speculator is None:
+            return None
+        return self.speculator.result(self.board, kind)
             
 
     def draw(self):
@@ -48,7 +173,11 @@ class Console(object):
 
 
     def new_board(self, root):
-        self.board = sudoku.Board(root, self.solvers)
+        board = getattr(self, 'board', None)
+        if board is not None and board.dimensions.root == root:
+            board.reset()
+        else:
+            self.board = sudoku.Board(root, self.solvers)
         self.vertical_separator_every = self.board.dimensions.root
         self.horizontal_separator_every = self.board.dimensions.root
     
@@ -63,7 +192,12 @@ class Console(object):
         
         
     def find_next_move(self):
-        (cell, value) = self.board.find_move()
+        hint = self.speculated(Speculator.HINT)
+        if hint is not None:
+            (row, col, value) = hint
+            (cell, value) = (self.board.row(row).cell(col), value)
+        else:
+            (cell, value) = self.board.find_move()
         if cell is None:
             self._error_message = "No move found"
             return False
@@ -163,10 +297,11 @@ class Console(object):
 q - Quit game
 n [root] - new game with root dimension (root = 2|3|4)
 f - Find next move
-v - Solve game
-i [row col] - interrogate cell
+v [count] - Solve game, or play only the next count moves
+i [row col] - interrogate cell (the most constrained cell if none given)
 l [file] - Load a previously saved game (.json)
 s [file] - Save game (.json)
+b - Toggle background solving while waiting for input
 h - print help
 """
 
@@ -184,9 +319,21 @@ h - print help
         
         
     def cmd_i(self, params):
+        if not params:
+            cell = self.board.most_constrained_cell()
+            if cell is None:
+                self._error_message = "No empty cell"
+            else:
+                print "Cell(%d, %d): %s" % (cell.row, cell.col, self.board.candidates(cell))
+            return
         try:
             [row, col] = [self.CELL_CHARS.find(tok.upper()) for tok in params]
-            print "Cell(%d, %d): %s" % (row, col, self.board.row(row).cell(col).allowed_moves())
+            candidates = self.speculated(Speculator.CANDIDATES)
+            if candidates is not None and (row, col) in candidates:
+                allowed = candidates[(row, col)]
+            else:
+                allowed = self.board.row(row).cell(col).allowed_moves()
+            print "Cell(%d, %d): %s" % (row, col, allowed)
         except:
             self._error_message = "Cannot find cell %s" %params
 
@@ -196,9 +343,31 @@ h - print help
         self.find_next_move()
 
 
-    # Solve game        
+    # Solve game, or play the next params[0] moves
     def cmd_v(self, params):
-        return self.board.solve()
+        try:
+            count = int(params[0])
+        except:
+            solution = self.speculated(Speculator.SOLUTION)
+            if solution is None:
+                return self.board.solve()
+            return self.board.fill(solution)
+        steps = self.board.solve_steps()
+        try:
+            for step in itertools.islice(steps, max(count, 0)):
+                pass
+        finally:
+            steps.close()
+        return self.board.finished()
+        
+        
+    # Toggle background solving
+    def cmd_b(self, params):
+        if self.speculator is None:
+            self.speculator = Speculator(self.solvers)
+        else:
+            self.speculator.stop()
+            self.speculator = None
         
         
     def cmd_l(self, params):
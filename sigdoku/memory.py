@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+import gc
+import sys
+import types
+
+import sudoku
+
+
+# Bytes allowed for an empty Board of each root, as measured by board_footprint
+BOARD_BUDGETS = {
+    2: 16000,
+    3: 56000,
+    4: 150000,
+}
+
+# Never counted in a footprint: they are shared by all the objects of a kind
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj, exclude=()):
+    """
+    Bytes used by obj and by all the objects it references, each counted once;
+    classes, modules, functions and the objects in exclude are not followed
+    """
+    seen = set(id(o) for o in exclude)
+    todo = [obj]
+    total = 0
+    while todo:
+        o = todo.pop()
+        if id(o) in seen or isinstance(o, _SHARED_TYPES):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        todo.extend(gc.get_referents(o))
+    return total
+    
+    
+def board_footprint(board):
+    """
+    Bytes used by a board, not counting its solvers, the Zobrist keys and 
+    the peer indexes which are shared with the other boards
+    """
+    dims = board.dimensions
+    return deep_sizeof(board, list(board.solvers) + [dims.zobrist_keys, dims.peer_indexes])
+    
+    
+def footprint_report(roots=sudoku.Dimensions.VALID_ROOTS):
+    """
+    A dict root -> bytes used by an empty Board of that root
+    """
+    return dict((root, board_footprint(sudoku.Board(root))) for root in roots)
+    
+    
+def over_budget(budgets=BOARD_BUDGETS):
+    """
+    A dict root -> (bytes, budget) with the roots whose empty Board footprint 
+    exceeds the budget
+    """
+    report = footprint_report(sorted(budgets))
+    return dict((root, (report[root], budgets[root])) for root in report if report[root] > budgets[root])
+    
+    
+class _AllocationCounter(object):
+    """
+    A profile function sampling, at every call and return, the gc count of 
+    container objects allocated and not freed since start(). With the
+    collector disabled the count only moves with allocations and frees, so
+    its rises add up to the objects allocated and its maximum is the peak.
+    mark() starts a nested measure: mark_peak() is the peak since then
+    """
+    def __init__(self):
+        self.peak = 0
+        self.allocated = 0
+        self.__last = 0
+        self.__mark = 0
+        self.__mark_peak = 0
+        
+
+    def __call__(self, frame, event, arg):
+        count = gc.get_count()[0]
+        if count > self.__last:
+            self.allocated += count - self.__last
+        self.__last = count
+        if count > self.peak:
+            self.peak = count
+        if count > self.__mark_peak:
+            self.__mark_peak = count
+            
+
+    def start(self):
+        # A collection zeroes the count
+        gc.collect()
+        self.peak = self.allocated = self.__last = self.__mark = self.__mark_peak = 0
+        sys.setprofile(self)
+        
+
+    def stop(self):
+        sys.setprofile(None)
+        self(None, 'stop', None)
+        
+        
+    def mark(self):
+        self(None, 'mark', None)
+        self.__mark = self.__mark_peak = self.__last
+        
+        
+    def mark_peak(self):
+        self(None, 'mark', None)
+        return self.__mark_peak - self.__mark
+        
+        
+        
+class _ProfiledSolver(object):
+    """
+    Wraps a solver to record the peak objects of each find_move call
+    """
+    def __init__(self, solver, counter, peaks):
+        self.solver = solver
+        self.name = solver.__class__.__name__
+        self.__counter = counter
+        self.__peaks = peaks
+        self.found = False
+        
+        
+    def find_move(self, board, allowed_moves):
+        self.__counter.mark()
+        (cell, value) = self.solver.find_move(board, allowed_moves)
+        peak = self.__counter.mark_peak()
+        self.__peaks[self.name] = max(self.__peaks.get(self.name, 0), peak)
+        self.found = cell is not None
+        return (cell, value)
+        
+    
+def profile_solve(board):
+    """
+    Solve the board with Board.solve_steps, as Board.solve does, while 
+    counting the container objects allocated. Return a list with a (row, col,
+    value, solver name, peak objects, allocated objects) tuple per step, where
+    peak is the most objects alive at once beyond those alive when the step 
+    began and allocated counts the objects created during the step, and a 
+    dict solver name -> peak objects of a single call of the solver.
+    The first step includes building the allowed moves. Objects created and 
+    freed between two calls are not seen, so the counts are lower bounds.
+    The board solvers are wrapped during the solve
+    """
+    counter = _AllocationCounter()
+    peaks = {}
+    solvers = board.solvers
+    original = list(solvers)
+    wrapped = [_ProfiledSolver(solver, counter, peaks) for solver in original]
+    enabled = gc.isenabled()
+    gc.disable()
+    steps = []
+    try:
+        solvers[:] = wrapped
+        solve_steps = board.solve_steps()
+        while True:
+            counter.start()
+            step = next(solve_steps, None)
+            counter.stop()
+            if step is None:
+                break
+            (row, col, value, name) = step
+            # The solvers before the one that found the move were called too
+            name = [w.name for w in wrapped if w.found][0]
+            steps.append((row, col, value, name, counter.peak, counter.allocated))
+    finally:
+        sys.setprofile(None)
+        solvers[:] = original
+        if enabled:
+            gc.enable()
+    return (steps, peaks)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Puzzles shared by the tests and the benchmarks, written as batch.parse_puzzle
+reads them
+"""
+import sudoku
+from batch import parse_puzzle
+
+
+# The puzzle of the README, which the solvers finish
+README = '060030090705060000000002000040000608800943200070600003000007086204000700007850000'
+README_SOLUTION = '168734592725169834493582167349275618816943275572618943951427386284396751637851429'
+
+# Arto Inkala's puzzle, which needs a search
+INKALA = '800000000003600000070090200050007000000045700000100030001000068008500010090000400'
+INKALA_SOLUTION = '812753649943682175675491283154237896369845721287169534521974368438526917796318452'
+
+# Solved by the simple coloring and by the XY-chain solver respectively
+SIMPLE_COLORING = '000400300085003000207008000000000040670901800000080900008010007000005060900007405'
+XY_CHAIN = '051000000300400000670090000700000600090000020000060051000903004003050080002076103'
+
+# Unique 16x16 puzzles on which the solvers get stuck
+HARD_16 = [
+    'B0D004000FC0009000C0709G020A3460019G00C0300802D03000000A0000500E00004086050010G9F0EC00G0200043000000'
+    '05E000800B0D40060B000709F0000804D0B00G700E0FDA006000000F9G70000FC00100B008300G000E50600000020005G900'
+    '0D0000400D200043E000G0008600002000170C00001700050603A000',
+    '0000F0400201007D00063G000870900000C1000D3G000A0658000201F00600E000D70000AF00G3000F0400B00007000CG0B0'
+    '0000001C85D009008500000EA06400020D50003G40004B00E600C0020D080050C09206000B30000A00300D00019000A00EG0'
+    '07851C00D0051C0000AF00G30C200700B000040F0E0364A000000000',
+]
+
+
+def moves(puzzle):
+    return parse_puzzle(puzzle)[1]
+
+
+def board(puzzle, solvers=sudoku.ALL_SOLVERS):
+    """
+    A new board with the moves of the puzzle
+    """
+    (root, puzzle_moves) = parse_puzzle(puzzle)
+    new_board = sudoku.Board(root, solvers)
+    new_board.move(puzzle_moves)
+    return new_board
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+
+def variable(size, cell_index, value):
+    """
+    The CNF variable meaning 'the cell (zero-based index) has value'
+    """
+    return cell_index*size + value
+    
+    
+def encode(board):
+    """
+    The CNF of the board as (number of variables, list of clauses): every 
+    cell and every row, col and square takes each value exactly once, and the
+    cells with a value keep it. Literals are non-zero ints, -x is not x
+    """
+    size = board.size
+    index = dict((cell, i) for (i, cell) in enumerate(board.cells))
+    clauses = []
+    
+    def exactly_one(literals):
+        clauses.append(literals)
+        for i in range(len(literals)):
+            for j in range(i + 1, len(literals)):
+                clauses.append([-literals[i], -literals[j]])
+                
+    for cell in board.cells:
+        exactly_one([variable(size, index[cell], value) for value in board.dimensions.ALL_MOVES])
+        if cell.value:
+            clauses.append([variable(size, index[cell], cell.value)])
+    for group in board.all_groups:
+        for value in board.dimensions.ALL_MOVES:
+            exactly_one([variable(size, index[cell], value) for cell in group.cells])
+    return (size**3, clauses)
+    
+    
+def luby(i):
+    """
+    The i-th term (1-based) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+
+class CDCLSolver(object):
+    """
+    A conflict driven clause learning SAT solver: unit propagation with two
+    watched literals per clause, first UIP clause learning with non 
+    chronological backjumping, VSIDS decisions from an activity heap with 
+    phase saving and Luby restarts
+    """
+    
+    def __init__(self, num_vars, clauses, restart_base=100, decay=0.95):
+        self.num_vars = num_vars
+        self.restart_base = restart_base
+        self.decay = decay
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+        
+        self.__value = [0] * (num_vars + 1)      # 1 true, -1 false, 0 unassigned
+        self.__level = [0] * (num_vars + 1)
+        self.__reason = [None] * (num_vars + 1)
+        self.__phase = [-1] * (num_vars + 1)
+        self.__activity = [0.0] * (num_vars + 1)
+        self.__bump = 1.0
+        # Binary max heap of the decision variables by activity, and the 
+        # position of each variable in it (-1 if not in the heap)
+        self.__heap = list(range(1, num_vars + 1))
+        self.__heap_index = [-1] + list(range(num_vars))
+        self.__trail = []
+        self.__trail_lim = []
+        self.__qhead = 0
+        self.__watches = dict((lit, []) for var in range(1, num_vars + 1) for lit in (var, -var))
+        self.__clauses = []
+        self.__ok = True
+        for clause in clauses:
+            self.add_clause(clause)
+            
+            
+    def add_clause(self, literals):
+        """
+        Add a clause at decision level 0; return False if the formula became 
+        unsatisfiable
+        """
+        self.__cancel_until(0)
+        clause = []
+        for lit in literals:
+            if self.__lit_value(lit) == 1 or -lit in clause:
+                return True
+            if self.__lit_value(lit) == 0 and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.__ok = False
+        elif len(clause) == 1:
+            self.__enqueue(clause[0], None)
+            self.__ok = self.__ok and self.__propagate() is None
+        else:
+            self.__attach(clause)
+        return self.__ok
+        
+        
+    def solve(self):
+        """
+        Return a model as a list of the true variables, or None if the 
+        formula is unsatisfiable
+        """
+        if not self.__ok or self.__propagate() is not None:
+            self.__ok = False
+            return None
+        restart = 1
+        while True:
+            status = self.__search(self.restart_base * luby(restart))
+            if status is not None:
+                break
+            restart += 1
+            self.restarts += 1
+        if not status:
+            self.__ok = False
+            return None
+        model = [var for var in range(1, self.num_vars + 1) if self.__value[var] == 1]
+        self.__cancel_until(0)
+        return model
+        
+        
+    def __search(self, max_conflicts):
+        # True if satisfiable, False if unsatisfiable, None to restart
+        conflicts = 0
+        while True:
+            conflict = self.__propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.__trail_lim:
+                    return False
+                (learnt, backjump) = self.__analyze(conflict)
+                self.__cancel_until(backjump)
+                if len(learnt) == 1:
+                    self.__enqueue(learnt[0], None)
+                else:
+                    self.__attach(learnt)
+                    self.__enqueue(learnt[0], learnt)
+                self.__bump *= 1 / self.decay
+            elif conflicts >= max_conflicts:
+                self.__cancel_until(0)
+                return None
+            else:
+                var = self.__pick()
+                if var is None:
+                    return True
+                self.decisions += 1
+                self.__trail_lim.append(len(self.__trail))
+                self.__enqueue(var * self.__phase[var], None)
+                
+                
+    def __lit_value(self, lit):
+        value = self.__value[abs(lit)]
+        return value if lit > 0 else -value
+        
+        
+    def __attach(self, clause):
+        self.__clauses.append(clause)
+        self.__watches[clause[0]].append(clause)
+        self.__watches[clause[1]].append(clause)
+        
+        
+    def __enqueue(self, lit, reason):
+        var = abs(lit)
+        self.__value[var] = 1 if lit > 0 else -1
+        self.__level[var] = len(self.__trail_lim)
+        self.__reason[var] = reason
+        self.__trail.append(lit)
+        
+        
+    def __propagate(self):
+        # Return a conflicting clause, or None
+        value = self.__value
+        while self.__qhead < len(self.__trail):
+            false_lit = -self.__trail[self.__qhead]
+            self.__qhead += 1
+            self.propagations += 1
+            watchers = self.__watches[false_lit]
+            kept = []
+            conflict = None
+            i = 0
+            while i < len(watchers):
+                clause = watchers[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                first_value = value[abs(first)] if first > 0 else -value[abs(first)]
+                if first_value == 1:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if (value[abs(lit)] if lit > 0 else -value[abs(lit)]) != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        self.__watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if first_value == -1:
+                        conflict = clause
+                        kept.extend(watchers[i:])
+                        break
+                    self.__enqueue(first, clause)
+            self.__watches[false_lit] = kept
+            if conflict is not None:
+                self.__qhead = len(self.__trail)
+                return conflict
+        return None
+        
+        
+    def __analyze(self, conflict):
+        # First UIP: resolve the conflict with the reasons of the current 
+        # level literals until only one of them is left
+        level = len(self.__trail_lim)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        lit = None
+        index = len(self.__trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                if q == lit:
+                    continue
+                var = abs(q)
+                if var not in seen and self.__level[var] > 0:
+                    seen.add(var)
+                    self.__bump_activity(var)
+                    if self.__level[var] == level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while abs(self.__trail[index]) not in seen:
+                index -= 1
+            lit = self.__trail[index]
+            index -= 1
+            seen.discard(abs(lit))
+            pending -= 1
+            if not pending:
+                break
+            clause = self.__reason[abs(lit)]
+        learnt[0] = -lit
+        backjump = 0
+        if len(learnt) > 1:
+            best = max(range(1, len(learnt)), key=lambda i: self.__level[abs(learnt[i])])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backjump = self.__level[abs(learnt[1])]
+        return (learnt, backjump)
+        
+        
+    def __bump_activity(self, var):
+        self.__activity[var] += self.__bump
+        if self.__activity[var] > 1e100:
+            # Scaling all the activities keeps the heap order
+            self.__activity = [a * 1e-100 for a in self.__activity]
+            self.__bump *= 1e-100
+        if self.__heap_index[var] >= 0:
+            self.__heap_up(self.__heap_index[var])
+            
+            
+    def __cancel_until(self, level):
+        if len(self.__trail_lim) > level:
+            for lit in self.__trail[self.__trail_lim[level]:]:
+                var = abs(lit)
+                self.__phase[var] = 1 if lit > 0 else -1
+                self.__value[var] = 0
+                self.__reason[var] = None
+                if self.__heap_index[var] < 0:
+                    self.__heap_insert(var)
+            del self.__trail[self.__trail_lim[level]:]
+            del self.__trail_lim[level:]
+        self.__qhead = min(self.__qhead, len(self.__trail))
+        
+        
+    def __pick(self):
+        # The unassigned variable with the highest activity; the assigned ones
+        # popped on the way are inserted back when they are unassigned
+        value = self.__value
+        while self.__heap:
+            var = self.__heap_pop()
+            if not value[var]:
+                return var
+        return None
+        
+        
+    def __heap_insert(self, var):
+        self.__heap_index[var] = len(self.__heap)
+        self.__heap.append(var)
+        self.__heap_up(len(self.__heap) - 1)
+        
+        
+    def __heap_pop(self):
+        heap = self.__heap
+        top = heap[0]
+        last = heap.pop()
+        self.__heap_index[top] = -1
+        if heap:
+            heap[0] = last
+            self.__heap_index[last] = 0
+            self.__heap_down(0)
+        return top
+        
+        
+    def __heap_up(self, i):
+        heap, index, activity = self.__heap, self.__heap_index, self.__activity
+        var = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            if activity[heap[parent]] >= activity[var]:
+                break
+            heap[i] = heap[parent]
+            index[heap[i]] = i
+            i = parent
+        heap[i] = var
+        index[var] = i
+        
+        
+    def __heap_down(self, i):
+        heap, index, activity = self.__heap, self.__heap_index, self.__activity
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2*i + 1
+            if child >= size:
+                break
+            if child + 1 < size and activity[heap[child + 1]] > activity[heap[child]]:
+                child += 1
+            if activity[heap[child]] <= activity[var]:
+                break
+            heap[i] = heap[child]
+            index[heap[i]] = i
+            i = child
+        heap[i] = var
+        index[var] = i
+        
+        
+        
+def solutions(board, limit=1):
+    """
+    Up to limit solutions of the board as tuples of cell values, found by the
+    CDCL solver; each solution found is blocked before looking for the next
+    """
+    size = board.size
+    (num_vars, clauses) = encode(board)
+    solver = CDCLSolver(num_vars, clauses)
+    found = []
+    while limit is None or len(found) < limit:
+        model = solver.solve()
+        if model is None:
+            break
+        values = [0] * size**2
+        for var in model:
+            values[(var - 1) / size] = (var - 1) % size + 1
+        found.append(tuple(values))
+        if not solver.add_clause([-var for var in model if board.cells[(var - 1) / size].is_empty()]):
+            break
+    return found
+    
+    
+def solve(board):
+    """
+    Board.fill with the first solution of the CDCL solver, False if there is none
+    """
+    found = solutions(board, 1)
+    return bool(found) and board.fill(found[0])
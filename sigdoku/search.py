@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+import json
+import multiprocessing
+import os
+import time
+
+import sudoku
+
+
+class Search(object):
+    """
+    Depth first search for the solutions of a board: at every node the board
+    solvers place all the moves they can find, then the search branches on the
+    candidates of the most constrained empty cell.
+    The board is restored to its initial state when the search ends.
+    If checkpoint_path is given, the search state is saved there at most every
+    checkpoint_every seconds, and Search.resume continues from it
+    """
+    
+    def __init__(self, board, limit=1, transpositions=None, checkpoint_path=None, checkpoint_every=60):
+        self.board = board
+        self.limit = limit
+        self.transpositions = transpositions
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = 0
+        self.solutions = []
+        self.nodes = 0
+        # Cells placed by the search, in order
+        self.__trail = []
+        # One frame per branch point: [trail length, cell, untried values, solutions found before, state hash]
+        self.__stack = []
+        
+        
+    @classmethod
+    def resume(cls, checkpoint, solvers=sudoku.ALL_SOLVERS, transpositions=None, checkpoint_every=60):
+        """
+        A Search in the state saved by checkpoint(), from a file path or from 
+        the loaded data; run() continues where the saved search stopped, and 
+        keeps checkpointing to the same path
+        """
+        path = None
+        if not isinstance(checkpoint, dict):
+            path = checkpoint
+            with open(path, 'r') as f:
+                checkpoint = json.load(f)
+        board = sudoku.Board(checkpoint['dim'], solvers)
+        board.move(checkpoint['moves'])
+        state = checkpoint['search']
+        resumed = cls(board, state['limit'], transpositions, path, checkpoint_every)
+        resumed.nodes = state['nodes']
+        resumed.solutions = [tuple(values) for values in state['solutions']]
+        with board.batch():
+            for (row, col, value) in state['trail']:
+                cell = board.row(row).cell(col)
+                cell.move(value)
+                resumed.__trail.append(cell)
+        resumed.__stack = [[mark, board.row(row).cell(col), values, found, state_hash] 
+                           for (mark, row, col, values, found, state_hash) in state['stack']]
+        return resumed
+        
+        
+    def state(self):
+        """
+        The search state as JSON friendly data; 'dim' and 'moves' are the 
+        board before the search, as in the console saved games. The allowed
+        moves are not saved: the board rebuilds them from the values
+        """
+        trail = set(self.__trail)
+        return {
+            'dim': self.board.dimensions.root,
+            'moves': [(cell.row, cell.col, cell.value) for cell in self.board.cells 
+                      if cell.value and cell not in trail],
+            'search': {
+                'limit': self.limit,
+                'nodes': self.nodes,
+                'solutions': self.solutions,
+                'trail': [(cell.row, cell.col, cell.value) for cell in self.__trail],
+                'stack': [(mark, cell.row, cell.col, values, found, state_hash) 
+                          for (mark, cell, values, found, state_hash) in self.__stack],
+            }
+        }
+        
+        
+    def checkpoint(self):
+        """
+        Save the search state to checkpoint_path
+        """
+        write_checkpoint(self.checkpoint_path, self.state())
+        self.checkpoints += 1
+        
+        
+    def run(self, max_nodes=None):
+        """
+        Search until limit solutions are found (all of them if limit is None) 
+        or the tree is exhausted; return the solutions as tuples of cell values.
+        With max_nodes, stop after visiting that many nodes, saving a 
+        checkpoint if there is a checkpoint_path
+        """
+        stop_at = None if max_nodes is None else self.nodes + max_nodes
+        last_checkpoint = time.time()
+        try:
+            alive = self.__propagate()
+            while True:
+                if alive:
+                    if self.board.finished():
+                        self.solutions.append(self.board.values())
+                        if self.limit is not None and len(self.solutions) >= self.limit:
+                            break
+                    else:
+                        self.__branch()
+                if not self.__next_branch():
+                    break
+                # A branch value is placed but not propagated: resume starts here
+                if self.checkpoint_path is not None:
+                    if stop_at is not None and self.nodes >= stop_at or \
+                            time.time() - last_checkpoint >= self.checkpoint_every:
+                        self.checkpoint()
+                        last_checkpoint = time.time()
+                if stop_at is not None and self.nodes >= stop_at:
+                    break
+                alive = self.__propagate()
+        finally:
+            self.__undo(0)
+            self.__stack = []
+        return self.solutions
+        
+        
+    def __propagate(self):
+        self.nodes += 1
+        mark = len(self.board.moves)
+        self.board.solve(self.transpositions)
+        self.__trail.extend(self.board.row(row).cell(col) for (row, col, value) in self.board.moves[mark:])
+        if self.transpositions is not None and self.transpositions.is_dead(self.board.state_hash):
+            return False
+        cell = self.board.most_constrained_cell()
+        return cell is None or self.board.candidate_mask(cell) != 0
+        
+
+    def __branch(self):
+        (cell, values) = most_constrained(self.board)
+        self.__stack.append([len(self.__trail), cell, sorted(values), len(self.solutions), self.board.state_hash])
+        
+        
+    def __next_branch(self):
+        while self.__stack:
+            frame = self.__stack[-1]
+            (mark, cell, values) = frame[:3]
+            self.__undo(mark)
+            if values:
+                cell.move(values.pop(0))
+                self.__trail.append(cell)
+                return True
+            self.__stack.pop()
+            if self.transpositions is not None and len(self.solutions) == frame[3]:
+                self.transpositions.mark_dead(frame[4])
+        return False
+        
+        
+    def __undo(self, mark):
+        with self.board.batch():
+            while len(self.__trail) > mark:
+                self.__trail.pop().empty()
+        
+
+
+def write_checkpoint(path, data):
+    """
+    Write data as compact JSON to path, through a temporary file so that a 
+    killed process never leaves a truncated checkpoint
+    """
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.rename(temporary, path)
+    
+    
+def most_constrained(board):
+    """
+    The empty cell with the fewest allowed moves, and its allowed moves
+    """
+    cell = board.most_constrained_cell()
+    if cell is None:
+        return (None, None)
+    return (cell, board.candidates(cell))
+    
+    
+def value_moves(size, values):
+    """
+    The (row, col, value) moves that fill an empty board with the given values
+    """
+    return [(index / size + 1, index % size + 1, value) for (index, value) in enumerate(values) if value]
+    
+
+def _search_subtree(task):
+    (root, values, limit, solvers) = task
+    board = sudoku.Board(root, solvers)
+    board.move(value_moves(board.size, values))
+    return Search(board, limit).run()
+
+
+
+class ParallelSearch(object):
+    """
+    Split the search tree at its shallow branch points and search the 
+    subtrees in a pool of processes; the pool is terminated as soon as limit
+    solutions are found (limit=2 checks that the solution is unique)
+    """
+    
+    def __init__(self, board, limit=1, processes=None, tasks_per_process=4):
+        self.board = board
+        self.limit = limit
+        self.processes = processes or multiprocessing.cpu_count()
+        self.tasks_per_process = tasks_per_process
+        self.solutions = []
+        
+        
+    def run(self):
+        """
+        Return the solutions found as tuples of cell values; the board is 
+        left untouched
+        """
+        self.solutions = []
+        tasks = self.split()
+        if tasks and not self.__enough():
+            pool = multiprocessing.Pool(self.processes)
+            try:
+                for solutions in pool.imap_unordered(_search_subtree, tasks):
+                    self.solutions.extend(solutions)
+                    if self.__enough():
+                        break
+            finally:
+                pool.terminate()
+                pool.join()
+        if self.limit is not None:
+            del self.solutions[self.limit:]
+        return self.solutions
+        
+        
+    def split(self):
+        """
+        Expand the tree breadth first until there are enough open nodes to 
+        keep the pool busy; solutions met on the way are collected, and the 
+        open nodes are returned as tasks for _search_subtree
+        """
+        root = self.board.dimensions.root
+        size = self.board.size
+        solvers = self.board.solvers
+        scratch = sudoku.Board(root, solvers)
+        frontier = [self.board.values()]
+        wanted = self.processes * self.tasks_per_process
+        while frontier and len(frontier) < wanted and not self.__enough():
+            expanded = []
+            for values in frontier:
+                scratch.load(value_moves(size, values))
+                scratch.solve()
+                if scratch.finished():
+                    self.solutions.append(scratch.values())
+                    continue
+                (cell, cam) = most_constrained(scratch)
+                for value in sorted(cam):
+                    cell.move(value)
+                    expanded.append(scratch.values())
+                    cell.empty()
+            frontier = expanded
+        return [(root, values, self.limit, solvers) for values in frontier]
+        
+        
+    def __enough(self):
+        return self.limit is not None and len(self.solutions) >= self.limit
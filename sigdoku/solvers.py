@@ -89,3 +89,210 @@ class CoupleTripletInGroupSolver(BaseSolver):
                                     allowed_moves[cell].remove(v)
         
        
+
+
+
+def sees(a, b):
+    """
+    True if the two cells share a row, a col or a square
+    """
+    return a.row == b.row or a.col == b.col or a.square == b.square
+
+
+
+class LinkGraph(object):
+    """
+    The strong links between the candidates of a board: a bivalue cell links
+    its two candidates, a bilocal group (a value allowed in two cells only)
+    links its two cells. 
+    The board calls cell_changed at every move, after updating its candidates:
+    the bivalue state of the cell and its peers is updated and the affected 
+    groups are marked for a lazy refresh
+    """
+    
+    def __init__(self, board):
+        self.__board = board
+        self.__bivalue = set(cell for cell in board.cells if self.__is_bivalue(cell))
+        self.__bilocal = dict((value, {}) for value in board.dimensions.ALL_MOVES)
+        self.__dirty = set((group, value) for group in board.all_groups for value in board.dimensions.ALL_MOVES)
+        
+        
+    def __is_bivalue(self, cell):
+        mask = self.__board.candidate_mask(cell)
+        # Clear the lowest bit: a single bit must be left
+        mask &= mask - 1
+        return mask != 0 and mask & (mask - 1) == 0
+        
+        
+    def cell_changed(self, cell, old_value, peers):
+        # peers are the zero-based indexes of the peers of cell
+        value = cell.value or old_value
+        cells = self.__board.cells
+        for c in [cell] + [cells[index] for index in peers]:
+            if self.__is_bivalue(c):
+                self.__bivalue.add(c)
+            else:
+                self.__bivalue.discard(c)
+            for group in c.groups:
+                self.__dirty.add((group, value))
+        for group in cell.groups:
+            self.__dirty.update((group, v) for v in self.__board.dimensions.ALL_MOVES)
+        
+        
+    def candidates(self, cell):
+        return self.__board.candidates(cell)
+        
+        
+    @property
+    def bivalue_cells(self):
+        return self.__bivalue
+        
+        
+    def strong_links(self, value):
+        """
+        The pairs of cells that are the only places for value in a group
+        """
+        self.__refresh()
+        return self.__bilocal[value].values()
+        
+        
+    def __refresh(self):
+        for (group, value) in self.__dirty:
+            cells = [cell for cell in group.cells if self.__board.candidate_mask(cell) >> value & 1]
+            if len(cells) == 2:
+                self.__bilocal[value][group] = tuple(cells)
+            else:
+                self.__bilocal[value].pop(group, None)
+        self.__dirty.clear()
+        
+        
+        
+class SimpleColoringSolver(BaseSolver):
+    """
+    Color with two colors the chains of cells strongly linked on a value:
+    if two cells of the same color see each other that color is false, and
+    a cell that sees both colors cannot take the value
+    """
+    
+    def reduce_allowed_moves(self, board, allowed_moves):
+        graph = board.link_graph
+        for value in board.dimensions.ALL_MOVES:
+            neighbours = {}
+            for (a, b) in graph.strong_links(value):
+                neighbours.setdefault(a, []).append(b)
+                neighbours.setdefault(b, []).append(a)
+            colored = set()
+            for start in neighbours:
+                if start not in colored:
+                    colors = self.__color(start, neighbours)
+                    colored.update(colors[0] + colors[1])
+                    self.__eliminate(board, value, colors, allowed_moves)
+                    
+                    
+    def __color(self, start, neighbours):
+        colors = ([start], [])
+        color_of = {start: 0}
+        todo = [start]
+        while todo:
+            cell = todo.pop()
+            for other in neighbours[cell]:
+                if other not in color_of:
+                    color_of[other] = 1 - color_of[cell]
+                    colors[color_of[other]].append(other)
+                    todo.append(other)
+        return colors
+        
+        
+    def __eliminate(self, board, value, colors, allowed_moves):
+        for (color, cells) in enumerate(colors):
+            if any(sees(a, b) for a in cells for b in cells if a is not b):
+                for cell in cells:
+                    allowed_moves[cell].discard(value)
+                for cell in colors[1 - color]:
+                    # The other color is true
+                    allowed_moves[cell] = set([value]) & allowed_moves[cell]
+                return
+        chain = set(colors[0] + colors[1])
+        for cell in board.cells:
+            if not cell.value and cell not in chain and value in allowed_moves[cell]:
+                if any(sees(cell, c) for c in colors[0]) and any(sees(cell, c) for c in colors[1]):
+                    allowed_moves[cell].discard(value)
+                    
+
+
+class XYWingSolver(BaseSolver):
+    """
+    A bivalue pivot {x, y} sees two bivalue pincers {x, z} and {y, z}: 
+    whatever the pivot value, one of the pincers is z, so z is removed from the 
+    cells that see both pincers
+    """
+    
+    def reduce_allowed_moves(self, board, allowed_moves):
+        graph = board.link_graph
+        bivalue = list(graph.bivalue_cells)
+        for pivot in bivalue:
+            (x, y) = graph.candidates(pivot)
+            pincers = [c for c in bivalue if c is not pivot and sees(pivot, c)]
+            for a in pincers:
+                a_cands = graph.candidates(a)
+                if x not in a_cands or y in a_cands:
+                    continue
+                z = list(a_cands - set([x]))[0]
+                for b in pincers:
+                    if graph.candidates(b) == set([y, z]):
+                        deny_seen_by_both(board, z, a, b, allowed_moves)
+                        
+
+
+class XYChainSolver(BaseSolver):
+    """
+    A chain of bivalue cells, each seeing the next and sharing a value with it:
+    if the first cell is not z the last one is z, so z is removed from the 
+    cells that see both ends of the chain
+    """
+    
+    def __init__(self, max_length=None):
+        self.max_length = max_length
+        
+        
+    def reduce_allowed_moves(self, board, allowed_moves):
+        graph = board.link_graph
+        bivalue = list(graph.bivalue_cells)
+        seen = dict((cell, [c for c in bivalue if c is not cell and sees(cell, c)]) for cell in bivalue)
+        for start in bivalue:
+            for z in graph.candidates(start):
+                self.__follow(board, graph, seen, start, z, allowed_moves)
+                
+                
+    def __follow(self, board, graph, seen, start, z, allowed_moves):
+        # Breadth first over (cell, value the cell takes if start is not z)
+        on = list(graph.candidates(start) - set([z]))[0]
+        visited = set([(start, on)])
+        level = [(start, on)]
+        length = 1
+        while level and (self.max_length is None or length < self.max_length):
+            length += 1
+            next_level = []
+            for (cell, value) in level:
+                for other in seen[cell]:
+                    other_cands = graph.candidates(other)
+                    if value not in other_cands:
+                        continue
+                    other_on = list(other_cands - set([value]))[0]
+                    if (other, other_on) in visited:
+                        continue
+                    visited.add((other, other_on))
+                    if other_on == z and other is not start:
+                        deny_seen_by_both(board, z, start, other, allowed_moves)
+                    next_level.append((other, other_on))
+            level = next_level
+            
+            
+            
+def deny_seen_by_both(board, value, a, b, allowed_moves):
+    """
+    Remove value from the empty cells that see both a and b
+    """
+    for cell in a.peers() & b.peers():
+        if not cell.value:
+            allowed_moves[cell].discard(value)
@@ -1,4 +1,8 @@
 # -*- coding: utf-8 -*-
+import random
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import solvers
 
 class SudokuException(Exception):
@@ -31,6 +35,9 @@ class Dimensions(object):
     of the allowed moves
     """
     VALID_ROOTS = [2, 3, 4]
+    __zobrist_tables = {}
+    __peer_tables = {}
+    __slots__ = ('__root', '__size', 'ALL_MOVES')
 
     def __init__(self, root):
         try:
@@ -75,11 +82,48 @@ class Dimensions(object):
         raise OutOfRangeException("Value not in range 0..%d: %s" % (self.__size, value))
 
 
+    @property
+    def zobrist_keys(self):
+        """
+        Random 64 bit keys indexed by [cell_index][value] (cell_index is zero-based);
+        the table is built once per root with a fixed seed, so hashes are stable
+        across boards and runs. Value 0 (empty cell) always has key 0
+        """
+        keys = Dimensions.__zobrist_tables.get(self.__root)
+        if keys is None:
+            rnd = random.Random(self.__root)
+            keys = [[0] + [rnd.getrandbits(64) for value in range(self.__size)]
+                    for cell_index in range(self.__size**2)]
+            Dimensions.__zobrist_tables[self.__root] = keys
+        return keys
+
+
+    @property
+    def peer_indexes(self):
+        """
+        The zero-based indexes of the peers of every cell, indexed by the 
+        zero-based cell index; built once per root
+        """
+        peers = Dimensions.__peer_tables.get(self.__root)
+        if peers is None:
+            (root, size) = (self.__root, self.__size)
+            peers = []
+            for index in range(size**2):
+                (row, col) = divmod(index, size)
+                square = (row / root, col / root)
+                peers.append(tuple(other for other in range(size**2) if other != index and (
+                    other / size == row or other % size == col or 
+                    (other / size / root, other % size / root) == square)))
+            Dimensions.__peer_tables[self.__root] = peers
+        return peers
+
+
 
 class Cell(object):
     """
     A board cell
     """
+    __slots__ = ('__value', '__dimensions', '__listeners', '__groups', 'row', 'col', 'square', 'index')
     
     def __init__(self, dimensions):
         self.__value = 0
@@ -89,6 +133,8 @@ class Cell(object):
         self.row = None
         self.col = None
         self.square = None
+        # Zero-based position in the board cells
+        self.index = None
 
 
     @property
@@ -126,10 +172,29 @@ class Cell(object):
 
     def add_group(self, group):
         self.__groups.append(group)
+
+
+    @property
+    def groups(self):
+        return self.__groups
+
+
+    def peers(self):
+        """
+        The other cells sharing a group with this cell
+        """
+        return set(c for group in self.__groups for c in group.cells if c is not self)
         
         
     def empty(self):
         self.move(0)
+
+
+    def reset(self):
+        """
+        Empty the cell without notifying the listeners
+        """
+        self.__value = 0
     
         
     def is_empty(self):
@@ -144,6 +209,7 @@ class Cell(object):
         
 
 class BaseCellGroup(object):
+    __slots__ = ('__cells', '__dimensions')
 
     def __init__(self, dimensions):
         self.__cells = []
@@ -189,25 +255,48 @@ class BaseCellGroup(object):
 
 
 class CellGroup(BaseCellGroup):
+    __slots__ = ('index', '__counts')
     
     def __init__(self, dimensions):
         super(CellGroup, self).__init__(dimensions)
         self.index = None
+        # How many cells hold each value; index 0 is not used
+        self.__counts = [0] * (dimensions.size + 1)
 
 
     def add_cell(self, cell):
         super(CellGroup, self).add_cell(cell)
         cell.add_group(self)
+        if cell.value:
+            self.__counts[cell.value] += 1
+
+
+    def cell_changed(self, cell, old_value):
+        if old_value:
+            self.__counts[old_value] -= 1
+        if cell.value:
+            self.__counts[cell.value] += 1
+
+
+    def reset(self):
+        """
+        Forget the values, to be called after resetting the cells
+        """
+        self.__counts = [0] * (self.dimensions.size + 1)
+
+
+    def has_value(self, value):
+        return self.__counts[value] > 0
 
         
     def allowed_moves(self):
-        return self.dimensions.all_moves().difference(
-            set([cell.value for cell in self.cells])
-        )
+        counts = self.__counts
+        return set(value for value in self.dimensions.ALL_MOVES if not counts[value])
 
         
         
 class Square(CellGroup):
+    __slots__ = ('rows', 'cols')
 
     def __init__(self, dimensions):
         super(Square, self).__init__(dimensions)
@@ -215,11 +304,52 @@ class Square(CellGroup):
         self.cols = []
     
         
+
+
+# Kinds of change delivered to the Board change listeners
+VALUE_PLACED = 'placed'
+VALUE_CLEARED = 'cleared'
+CANDIDATE_ELIMINATED = 'eliminated'
+ALL_CHANGES = (VALUE_PLACED, VALUE_CLEARED, CANDIDATE_ELIMINATED)
+
+
+class ChangeSet(object):
+    """
+    The net changes of a Board batch, as lists of (cell, value) pairs:
+    a value placed and then cleared within the same batch does not appear at all
+    """
+    __slots__ = ('placed', 'cleared', 'eliminated')
+
+    def __init__(self, placed=(), cleared=(), eliminated=()):
+        self.placed = list(placed)
+        self.cleared = list(cleared)
+        self.eliminated = list(eliminated)
+
+
+    def __len__(self):
+        return len(self.placed) + len(self.cleared) + len(self.eliminated)
+
+
+    def restricted(self, kinds):
+        """
+        A ChangeSet with only the given kinds of change
+        """
+        return ChangeSet(
+            self.placed if VALUE_PLACED in kinds else (),
+            self.cleared if VALUE_CLEARED in kinds else (),
+            self.eliminated if CANDIDATE_ELIMINATED in kinds else ()
+        )
+
     
 # Convenience global with all the solvers in the right order
-ALL_SOLVERS = [solvers.BaseSolver(), solvers.RowColInSquareSolver(), solvers.CoupleTripletInGroupSolver()]
+ALL_SOLVERS = [solvers.BaseSolver(), solvers.RowColInSquareSolver(), solvers.CoupleTripletInGroupSolver(),
+               solvers.SimpleColoringSolver(), solvers.XYWingSolver(), solvers.XYChainSolver()]
     
 class Board(BaseCellGroup):
+    __slots__ = ('__rows', '__cols', '__squares', '__solvers', '__moves', '__zobrist', '__state_hash',
+                 '__change_listeners', '__batch_depth', '__batch_start', '__batch_masks',
+                 '__link_graph', '__candidate_masks', '__candidate_counts', '__full_mask',
+                 '__buckets', '__peers')
     
     def __init__(self, root=3, solvers=ALL_SOLVERS):
         super(Board, self).__init__(Dimensions(root))
@@ -229,6 +359,22 @@ class Board(BaseCellGroup):
         self.__squares = self.__makeCellGroups(Square)
         self.__solvers = list(solvers)[:]
         self.__moves = []
+        self.__zobrist = self.dimensions.zobrist_keys
+        self.__peers = self.dimensions.peer_indexes
+        self.__state_hash = 0
+        self.__change_listeners = []
+        self.__batch_depth = 0
+        self.__batch_start = OrderedDict()
+        # Candidate masks at the start of the batch, by cell index
+        self.__batch_masks = {}
+        self.__link_graph = None
+        # The allowed moves of every cell as a bitmask: bit v set if v is allowed
+        self.__full_mask = sum(1 << value for value in self.dimensions.ALL_MOVES)
+        self.__candidate_masks = [self.__full_mask] * self.dimensions.size**2
+        self.__candidate_counts = None
+        # Bucket queue of the empty cell indexes, by number of allowed moves
+        self.__buckets = None
+        self.__reset_buckets()
 
         cells_per_facet = self.dimensions.size
         cells_per_board = cells_per_facet**2        
@@ -244,6 +390,7 @@ class Board(BaseCellGroup):
             self.__cols[board_col].add_cell(cell)
             cell.row = board_row + 1
             cell.col = board_col + 1
+            cell.index = cell_index
             
             cell_square_index = cell_index / cells_per_square_facet
             square_row = cell_square_index / cells_per_square_facet / cells_per_square_facet
@@ -272,8 +419,43 @@ class Board(BaseCellGroup):
 
           
     def move(self, moves):
-        for (row, col, value) in moves:
-            self.row(row).cell(col).move(value)
+        with self.batch():
+            for (row, col, value) in moves:
+                self.row(row).cell(col).move(value)
+
+
+    def reset(self):
+        """
+        Empty all the cells and forget the moves, keeping the cells and groups
+        wiring so the same instance can be reused for another game. The change
+        listeners are kept and get the cleared cells
+        """
+        with self.batch():
+            if self.__change_listeners:
+                for cell in self.cells:
+                    if cell.value and cell not in self.__batch_start:
+                        self.__batch_start[cell] = cell.value
+                if self.__wants_eliminated():
+                    for index in range(self.num_cells):
+                        self.__batch_masks.setdefault(index, self.__candidate_masks[index])
+            for cell in self.cells:
+                cell.reset()
+            for group in self.all_groups:
+                group.reset()
+            self.__candidate_masks = [self.__full_mask] * self.dimensions.size**2
+            self.__reset_buckets()
+            del self.__moves[:]
+            self.__state_hash = 0
+            self.__link_graph = None
+
+
+    def load(self, moves):
+        """
+        Reset the board and play the given moves, as a single batch of changes
+        """
+        with self.batch():
+            self.reset()
+            self.move(moves)
 
 
     def __makeCellGroups(self, clazz=CellGroup):
@@ -320,8 +502,207 @@ class Board(BaseCellGroup):
         return self.__moves
 
 
+    @property
+    def solvers(self):
+        return self.__solvers
+
+
+    @property
+    def state_hash(self):
+        """
+        64 bit Zobrist hash of the cell values, updated at every move
+        """
+        return self.__state_hash
+
+
     def cell_changed(self, cell, old_value):
         self.__moves.append((cell.row, cell.col, cell.value))
+        peers = self.__peers[cell.index]
+        keys = self.__zobrist[cell.index]
+        self.__state_hash ^= keys[old_value] ^ keys[cell.value]
+        if self.__change_listeners:
+            self.__record_change(cell, old_value, peers)
+        self.__update_candidates(cell, old_value, peers)
+        if self.__link_graph is not None:
+            self.__link_graph.cell_changed(cell, old_value, peers)
+        if self.__change_listeners:
+            if not self.__batch_depth:
+                self.__deliver_changes()
+
+
+    def __update_candidates(self, cell, old_value, peers):
+        # A placed value leaves the cell and its peers; a cleared value comes
+        # back to the peers that have no other group holding it. Either way 
+        # a peer gains or loses a single candidate, so it moves by one bucket
+        masks = self.__candidate_masks
+        counts = self.__candidate_counts
+        buckets = self.__buckets
+        cells = self.cells
+        index = cell.index
+        if cell.value:
+            buckets[counts[index]].discard(index)
+            masks[index] = counts[index] = 0
+            bit = 1 << cell.value
+            for p in peers:
+                if masks[p] & bit:
+                    masks[p] ^= bit
+                    count = counts[p]
+                    buckets[count].discard(p)
+                    buckets[count - 1].add(p)
+                    counts[p] = count - 1
+        else:
+            mask = self.__full_mask
+            for p in peers:
+                mask &= ~(1 << cells[p].value)
+            masks[index] = mask
+            counts[index] = bin(mask).count('1')
+            buckets[counts[index]].add(index)
+            bit = 1 << old_value
+            for p in peers:
+                peer = cells[p]
+                if peer.value:
+                    continue
+                for group in peer.groups:
+                    if group.has_value(old_value):
+                        break
+                else:
+                    masks[p] |= bit
+                    count = counts[p]
+                    buckets[count].discard(p)
+                    buckets[count + 1].add(p)
+                    counts[p] = count + 1
+
+
+    def __reset_buckets(self):
+        size = self.dimensions.size
+        self.__candidate_counts = [size] * size**2
+        self.__buckets = [set() for count in range(size + 1)]
+        self.__buckets[size].update(range(size**2))
+
+
+    def most_constrained_cell(self):
+        """
+        An empty cell with the fewest allowed moves (maybe none), or None if 
+        the board is finished
+        """
+        for bucket in self.__buckets:
+            for index in bucket:
+                return self.cells[index]
+        return None
+
+
+    def cells_by_constraint(self):
+        """
+        Iterate over the cells empty at the call, fewest allowed moves first;
+        the order is taken at the call, so the board may change meanwhile
+        """
+        order = [index for bucket in self.__buckets for index in bucket]
+        for index in order:
+            yield self.cells[index]
+
+
+    def candidate_mask(self, cell):
+        """
+        The allowed moves of the cell as a bitmask, bit v set if v is allowed
+        """
+        return self.__candidate_masks[cell.index]
+
+
+    def candidates(self, cell):
+        """
+        The allowed moves of the cell, kept up to date at every move
+        """
+        mask = self.candidate_mask(cell)
+        return set(value for value in self.dimensions.ALL_MOVES if mask >> value & 1)
+
+
+    def allowed_moves_for_cells(self):
+        return dict((cell, self.candidates(cell)) for cell in self.cells)
+
+
+    def add_change_listener(self, listener, kinds=ALL_CHANGES):
+        """
+        listener.board_changed(board, change_set) is called once per batch
+        with the changes of the given kinds, if there are any
+        """
+        self.__change_listeners.append((listener, frozenset(kinds)))
+
+
+    def remove_change_listener(self, listener):
+        self.__change_listeners[:] = [(l, k) for (l, k) in self.__change_listeners if l is not listener]
+
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect the changes made within the block and deliver them to the change
+        listeners as a single ChangeSet when the outermost batch ends
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if not self.__batch_depth:
+                self.__deliver_changes()
+
+
+    def __wants_eliminated(self):
+        return any(CANDIDATE_ELIMINATED in kinds for (l, kinds) in self.__change_listeners)
+
+
+    def __record_change(self, cell, old_value, peers):
+        # Called before the candidates are updated, so the masks saved are
+        # those of the batch start
+        if cell not in self.__batch_start:
+            self.__batch_start[cell] = old_value
+        if self.__wants_eliminated():
+            masks = self.__candidate_masks
+            batch_masks = self.__batch_masks
+            for index in (cell.index,) + peers:
+                if index not in batch_masks:
+                    batch_masks[index] = masks[index]
+
+
+    def __deliver_changes(self):
+        if not self.__batch_start:
+            # No value changed, so no candidate did
+            self.__batch_masks.clear()
+            return
+        placed, cleared = [], []
+        for (cell, start_value) in self.__batch_start.items():
+            if cell.value != start_value:
+                if start_value:
+                    cleared.append((cell, start_value))
+                if cell.value:
+                    placed.append((cell, cell.value))
+        # The candidates of the empty cells that were there at the batch start
+        # and are gone now
+        eliminated = []
+        masks = self.__candidate_masks
+        for (index, start_mask) in sorted(self.__batch_masks.items()):
+            cell = self.cells[index]
+            lost = start_mask & ~masks[index]
+            if lost and not cell.value:
+                eliminated.extend((cell, value) for value in self.dimensions.ALL_MOVES if lost >> value & 1)
+        self.__batch_start.clear()
+        self.__batch_masks.clear()
+        changes = ChangeSet(placed, cleared, eliminated)
+        for (listener, kinds) in list(self.__change_listeners):
+            restricted = changes.restricted(kinds)
+            if len(restricted):
+                listener.board_changed(self, restricted)
+
+
+    @property
+    def link_graph(self):
+        """
+        The solvers.LinkGraph of the board, built on first use and then kept
+        up to date at every move
+        """
+        if self.__link_graph is None:
+            self.__link_graph = solvers.LinkGraph(self)
+        return self.__link_graph
 
 
     @property
@@ -330,29 +711,291 @@ class Board(BaseCellGroup):
 
 
     def find_move(self):
-        allowed_moves = self.allowed_moves_for_cells()
+        (cell, value, solver) = self.__find_move(self.allowed_moves_for_cells())
+        return (cell, value)
+
+
+    def __find_move(self, allowed_moves):
         for solver in self.__solvers:
             (c, v) = solver.find_move(self, allowed_moves)
             if c is not None:
-                return (c, v)
-        return (None, None)
+                return (c, v, solver)
+        return (None, None, None)
         
         
     def finished(self):
         return all([cell.value for cell in self.cells])
 
 
-    def solve(self):
+    def solve(self, transpositions=None):
+        """
+        Apply the solvers until the board is finished or no move is found.
+        If a TranspositionTable is given, a state already seen is not solved 
+        again: its recorded outcome is replayed instead
+        """
+        if transpositions is not None:
+            start_hash = self.__state_hash
+            entry = transpositions.get(start_hash)
+            if entry is not None:
+                return self.__replay(entry)
+        with self.batch():
+            for step in self.solve_steps():
+                pass
+        solved = self.finished()
+        if transpositions is not None:
+            transpositions.store(start_hash, 
+                TranspositionTable.SOLVED if solved else TranspositionTable.STUCK,
+                self.values())
+        return solved
+
+
+    def solve_steps(self):
+        """
+        Apply the solvers one move at a time, yielding (row, col, value, solver name)
+        as soon as each move is placed. The allowed moves, with the eliminations
+        made by the solvers, are kept between the steps and only updated for the 
+        peers of the moved cell; the board should not be changed by others while
+        the generator is suspended. Close the generator to stop early
+        """
+        allowed_moves = self.allowed_moves_for_cells()
         while not self.finished():
-            (cell, value) = self.find_move()
+            (cell, value, solver) = self.__find_move(allowed_moves)
             if cell is None:
-                return False
-            else:
-                cell.move(value)
-        return True
+                return
+            cell.move(value)
+            allowed_moves[cell] = set()
+            for peer in cell.peers():
+                allowed_moves[peer].discard(value)
+            yield (cell.row, cell.col, value, solver.__class__.__name__)
+
+
+    def __replay(self, entry):
+        (status, values) = entry
+        if status == TranspositionTable.DEAD:
+            return False
+        self.fill(values)
+        return status == TranspositionTable.SOLVED
+
+
+    def fill(self, values):
+        """
+        Move the non-zero values, given row by row, into the empty cells as a
+        single batch; return whether the board is finished
+        """
+        with self.batch():
+            for (cell, value) in zip(self.cells, values):
+                if value and not cell.value:
+                    cell.move(value)
+        return self.finished()
+
+
+    def values(self):
+        """
+        The cell values, row by row, as a tuple
+        """
+        return tuple(cell.value for cell in self.cells)
+
+
+    def freeze(self):
+        """
+        An immutable FrozenBoard with the current values
+        """
+        return FrozenBoard.from_board(self)
         
         
     def dump(self):
         return '\n'.join([''.join([str(cell.value) for cell in row.cells]) for row in self.rows])
-            
-            
+
+
+
+class FrozenBoard(object):
+    """
+    An immutable board state, stored as a tuple of row tuples. set() returns a
+    new FrozenBoard that shares all the unchanged rows with this one and
+    updates the Zobrist hash in O(1); the hash is the Board.state_hash of the 
+    same values. Instances can be shared between threads and used as dict keys
+    """
+    __slots__ = ('__dimensions', '__rows', '__hash')
+
+    def __init__(self, root=3, rows=None):
+        self.__dimensions = Dimensions(root)
+        size = self.__dimensions.size
+        if rows is None:
+            empty_row = (0,) * size
+            self.__rows = (empty_row,) * size
+            self.__hash = 0
+        else:
+            self.__rows = tuple(tuple(self.__dimensions.get_int_in_range(v) for v in row) for row in rows)
+            if len(self.__rows) != size or any(len(row) != size for row in self.__rows):
+                raise OutOfRangeException('Rows are not %dx%d' % (size, size))
+            for (r, row) in enumerate(self.__rows):
+                for (c, value) in enumerate(row):
+                    if value and not self.__allowed(r, c, value):
+                        raise DeniedMoveException('The value in row %d col %d is denied for the cell' % (r + 1, c + 1))
+            keys = self.__dimensions.zobrist_keys
+            self.__hash = 0
+            for (index, value) in enumerate(self.values()):
+                self.__hash ^= keys[index][value]
+                
+                
+    @classmethod
+    def from_board(cls, board):
+        return cls(board.dimensions.root, [[cell.value for cell in row.cells] for row in board.rows])
+        
+        
+    def to_board(self, solvers=ALL_SOLVERS):
+        """
+        A new Board with the values of this one
+        """
+        board = Board(self.__dimensions.root, solvers)
+        board.move(self.moves())
+        return board
+        
+        
+    @property
+    def dimensions(self):
+        return self.__dimensions
+        
+        
+    @property
+    def rows(self):
+        return self.__rows
+        
+        
+    @property
+    def state_hash(self):
+        return self.__hash
+        
+        
+    def value(self, row, col):
+        return self.__rows[self.__dimensions.get_int_in_range(row) - 1][self.__dimensions.get_int_in_range(col) - 1]
+        
+        
+    def values(self):
+        """
+        The cell values, row by row, as a tuple
+        """
+        return sum(self.__rows, ())
+        
+        
+    def moves(self):
+        """
+        The (row, col, value) moves that fill an empty board with these values
+        """
+        return [(r + 1, c + 1, value) for (r, row) in enumerate(self.__rows) for (c, value) in enumerate(row) if value]
+        
+        
+    def set(self, row, col, value):
+        """
+        A FrozenBoard with value in the cell (0 empties it); the same rules as
+        Cell.move apply
+        """
+        dims = self.__dimensions
+        (r, c) = (dims.get_int_in_range(row) - 1, dims.get_int_in_range(col) - 1)
+        value = dims.get_int_in_range(value)
+        old_value = self.__rows[r][c]
+        if old_value == value:
+            return self
+        if old_value and value:
+            raise DeniedMoveException('The cell has already a value')
+        if value and not self.__allowed(r, c, value):
+            raise DeniedMoveException('This value is denied for the cell')
+        frozen = FrozenBoard.__new__(FrozenBoard)
+        frozen.__dimensions = dims
+        row_values = self.__rows[r]
+        frozen.__rows = self.__rows[:r] + (row_values[:c] + (value,) + row_values[c + 1:],) + self.__rows[r + 1:]
+        keys = dims.zobrist_keys[r*dims.size + c]
+        frozen.__hash = self.__hash ^ keys[old_value] ^ keys[value]
+        return frozen
+        
+        
+    def __allowed(self, r, c, value):
+        # No other cell of the row, col or square holds value
+        root = self.__dimensions.root
+        rows = self.__rows
+        (r0, c0) = (r - r % root, c - c % root)
+        return not (any(v == value for (j, v) in enumerate(rows[r]) if j != c) or
+                    any(row[c] == value for (i, row) in enumerate(rows) if i != r) or
+                    any(rows[i][j] == value for i in range(r0, r0 + root) for j in range(c0, c0 + root)
+                        if (i, j) != (r, c)))
+        
+        
+    def __hash__(self):
+        return hash(self.__hash)
+        
+        
+    def __eq__(self, other):
+        return self is other or (isinstance(other, FrozenBoard) and self.__hash == other.__hash 
+                                 and self.__rows == other.__rows)
+                                 
+                                 
+    def __ne__(self, other):
+        return not self == other
+        
+        
+    def dump(self):
+        return '\n'.join([''.join([str(value) for value in row]) for row in self.__rows])
+        
+        
+
+class TranspositionTable(object):
+    """
+    A bounded map from Board.state_hash to the known outcome of that state:
+    (SOLVED, values), (STUCK, values) when the solvers could go no further than
+    values, or (DEAD, None) for a state proven to have no solution.
+    The least recently used entries are dropped when capacity is exceeded
+    """
+    SOLVED = 'solved'
+    STUCK = 'stuck'
+    DEAD = 'dead'
+
+    def __init__(self, capacity=100000):
+        self.__capacity = capacity
+        self.__entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    def __contains__(self, state_hash):
+        return state_hash in self.__entries
+
+
+    def get(self, state_hash):
+        entry = self.__entries.pop(state_hash, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries[state_hash] = entry
+        return entry
+
+
+    def store(self, state_hash, status, values=None):
+        self.__entries.pop(state_hash, None)
+        self.__entries[state_hash] = (status, values)
+        while len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+
+    def is_dead(self, state_hash):
+        entry = self.__entries.get(state_hash)
+        return entry is not None and entry[0] == TranspositionTable.DEAD
+
+
+    def mark_dead(self, state_hash):
+        self.store(state_hash, TranspositionTable.DEAD)
+
+
+    def clear(self):
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import sudoku
+import search
+
+
+# In memory tables, by name
+_TABLES = {}
+
+
+def _cached(name, build, cache_dir):
+    """
+    The table called name: from memory, else from cache_dir/name.json if 
+    cache_dir is given and the file exists, else built and saved there
+    """
+    table = _TABLES.get(name)
+    if table is not None:
+        return table
+    path = os.path.join(cache_dir, name + '.json') if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            table = json.load(f)
+    else:
+        table = build()
+        if path:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            with open(path, 'w') as f:
+                json.dump(table, f)
+    _TABLES[name] = table
+    return table
+    
+    
+def clear():
+    """
+    Forget the tables kept in memory
+    """
+    _TABLES.clear()
+    
+    
+def grids_2(cache_dir=None):
+    """
+    All the 288 valid 4x4 grids, as lists of cell values row by row
+    """
+    return _cached('grids-2', lambda: [list(g) for g in search.Search(sudoku.Board(2, []), None).run()], cache_dir)
+    
+    
+def templates_3(cache_dir=None):
+    """
+    All the 46656 ways to place one value on a 9x9 board, once per row, col
+    and square, as bitmasks of the zero-based cell indexes
+    """
+    return _cached('templates-3', _build_templates_3, cache_dir)
+    
+    
+def _build_templates_3():
+    templates = []
+    
+    def place(row, mask, cols, squares):
+        if row == 9:
+            templates.append(mask)
+            return
+        for col in range(9):
+            square = (row / 3)*3 + col / 3
+            if not cols >> col & 1 and not squares >> square & 1:
+                place(row + 1, mask | 1 << (row*9 + col), cols | 1 << col, squares | 1 << square)
+                
+    place(0, 0, 0, 0)
+    return templates
+    
+    
+def solutions(board, limit=1, cache_dir=None):
+    """
+    Up to limit solutions (all if None) of a 4x4 or 9x9 board as tuples of 
+    cell values, found by table lookup instead of search
+    """
+    root = board.dimensions.root
+    if root == 2:
+        return _solutions_2(board, limit, cache_dir)
+    if root == 3:
+        return _solutions_3(board, limit, cache_dir)
+    raise sudoku.OutOfRangeException('No tables for root %d' % root)
+    
+    
+def solve(board, cache_dir=None):
+    """
+    Board.fill with the first solution in the tables, False if there is none
+    """
+    found = solutions(board, 1, cache_dir)
+    return bool(found) and board.fill(found[0])
+    
+    
+def _solutions_2(board, limit, cache_dir):
+    clues = [(i, value) for (i, value) in enumerate(board.values()) if value]
+    found = []
+    for grid in grids_2(cache_dir):
+        if all(grid[i] == value for (i, value) in clues):
+            found.append(tuple(grid))
+            if limit is not None and len(found) >= limit:
+                break
+    return found
+    
+    
+def _solutions_3(board, limit, cache_dir):
+    # The templates of each value must cover its cells and avoid the cells
+    # of the other values; then pick one template per value, all disjoint
+    values = board.values()
+    filled = 0
+    value_masks = dict((value, 0) for value in board.dimensions.ALL_MOVES)
+    for (i, value) in enumerate(values):
+        if value:
+            filled |= 1 << i
+            value_masks[value] |= 1 << i
+    candidates = {}
+    for (value, mask) in value_masks.items():
+        others = filled & ~mask
+        candidates[value] = [t for t in templates_3(cache_dir) if t & mask == mask and not t & others]
+    found = []
+    _pick_templates(candidates, 0, {}, found, limit)
+    return [tuple(_grid_values(chosen)) for chosen in found]
+    
+    
+def _pick_templates(candidates, used, chosen, found, limit):
+    if not candidates:
+        found.append(dict(chosen))
+        return
+    value = min(candidates, key=lambda v: len(candidates[v]))
+    rest = dict((v, ts) for (v, ts) in candidates.items() if v != value)
+    for template in candidates[value]:
+        if template & used:
+            continue
+        remaining = dict((v, [t for t in ts if not t & template]) for (v, ts) in rest.items())
+        if all(remaining.values()):
+            chosen[value] = template
+            _pick_templates(remaining, used | template, chosen, found, limit)
+            del chosen[value]
+            if limit is not None and len(found) >= limit:
+                return
+                
+                
+def _grid_values(chosen):
+    values = [0] * 81
+    for (value, template) in chosen.items():
+        for i in range(81):
+            if template >> i & 1:
+                values[i] = value
+    return values
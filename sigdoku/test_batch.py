@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import sudoku
+import batch
+import unittest
+
+
+CORPUS = """1200301000030321
+1000002000010200
+
+060030090705060000000002000040000608800943200070600003000007086204000700007850000
+..1.......2.....
+"""
+
+
+class TestBatchRunner(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.directory, 'corpus.txt')
+        with open(self.corpus, 'w') as f:
+            f.write(CORPUS)
+        self.output = os.path.join(self.directory, 'output.txt')
+        self.checkpoint = os.path.join(self.directory, 'batch.json')
+        
+        
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        
+        
+    def read_output(self):
+        with open(self.output, 'r') as f:
+            return f.read().split()
+            
+            
+    def assertFinished(self, line):
+        board = sudoku.Board(2)
+        board.load(batch.parse_puzzle(line)[1])
+        self.assertTrue(board.finished())
+        
+        
+    def test_parse_puzzle(self):
+        (root, moves) = batch.parse_puzzle('..1.......2....G' + '.' * 240)
+        self.assertEqual(4, root)
+        self.assertEqual([(1, 3, 1), (1, 11, 2), (1, 16, 16)], moves)
+        self.assertRaises(sudoku.OutOfRangeException, batch.parse_puzzle, '123')
+        
+        
+    def test_run(self):
+        runner = batch.BatchRunner(self.corpus, self.output)
+        self.assertEqual(4, runner.run())
+        output = self.read_output()
+        self.assertEqual(['1234341221434321', '-'], output[:2])
+        self.assertEqual('168734592', output[2][:9])
+        self.assertFinished(output[3])
+        
+        
+    def test_resume(self):
+        runner = batch.BatchRunner(self.corpus, self.output, self.checkpoint)
+        self.assertEqual(2, runner.run(max_puzzles=2))
+        self.assertEqual(1, runner.checkpoints)
+        # Output written after the checkpoint by a killed worker is dropped
+        with open(self.output, 'a') as f:
+            f.write('garbage\n')
+        resumed = batch.BatchRunner.resume(self.checkpoint)
+        self.assertEqual(2, resumed.offset)
+        self.assertEqual(2, resumed.run())
+        self.assertEqual(4, resumed.offset)
+        self.assertEqual(0, batch.BatchRunner.resume(self.checkpoint).run())
+        
+        expected = os.path.join(self.directory, 'expected.txt')
+        batch.BatchRunner(self.corpus, expected).run()
+        output = self.read_output()
+        with open(expected, 'r') as f:
+            self.assertEqual(f.read().split()[:3], output[:3])
+        # The last puzzle has many solutions, any of them will do
+        self.assertFinished(output[3])
+        
+
+
+    def test_invalid_lines(self):
+        with open(self.corpus, 'w') as f:
+            f.write('1200301000030321\n1100000000000000\n12003010000303X1\n12003\n1200301000030321\n')
+        runner = batch.BatchRunner(self.corpus, self.output, self.checkpoint)
+        self.assertEqual(2, runner.run(max_puzzles=2))
+        self.assertEqual(3, batch.BatchRunner.resume(self.checkpoint).run())
+        self.assertEqual(['1234341221434321', '!', '!', '!', '1234341221434321'], self.read_output())
+        
+        
+if __name__ == '__main__':
+    unittest.main()
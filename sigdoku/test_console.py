@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import threading
+import time
 import console
+import sudoku
+import puzzles
 import unittest
 
 
@@ -28,6 +32,84 @@ class TestConsole(unittest.TestCase):
         self.console.execute_command_line('8 a 19')
         self.assertNotEqual('', self.console.error_message)
 
+
+    def test_new_board_reuses_instance(self):
+        board = self.console.board
+        self.console.execute_command_line('2 5 8')
+        self.console.execute_command_line('n 3')
+        self.assertIs(board, self.console.board)
+        self.assertEqual(0, board.row(2).cell(5).value)
+        self.console.execute_command_line('n 2')
+        self.assertEqual(2, self.console.board.dimensions.root)
+
+
+    def test_solve_count(self):
+        self.console.execute_command_line('v 3')
+        self.assertEqual(0, len(self.console.board.moves))
+        self.console.board.move(puzzles.moves(puzzles.README))
+        self.console.execute_command_line('v 3')
+        self.assertEqual(30, len(self.console.board.moves))
+        self.console.execute_command_line('v')
+        self.assertTrue(self.console.board.finished())
+
+
+    def test_speculation(self):
+        self.console.execute_command_line('b')
+        speculator = self.console.speculator
+        try:
+            self.console.board.move([(1, c, c) for c in range(1, 9)])
+            self.console.speculate()
+            hint = speculator.result(self.console.board, console.Speculator.HINT, 10)
+            self.assertEqual((1, 9, 9), hint)
+            self.assertNotEqual(None, speculator.result(self.console.board, console.Speculator.SOLUTION, 10))
+            
+            hits = speculator.hits
+            self.console.execute_command_line('f')
+            self.assertEqual(9, self.console.board.row(1).cell(9).value)
+            self.assertEqual(hits + 1, speculator.hits)
+            
+            # The results of the previous state are not used anymore
+            self.assertEqual(None, speculator.result(self.console.board, console.Speculator.HINT))
+            self.console.speculate()
+            solution = speculator.result(self.console.board, console.Speculator.SOLUTION, 10)
+            # The solvers get stuck on this board: the solution is partial
+            self.assertEqual(81 - 9, solution.count(0))
+            self.console.execute_command_line('v')
+            self.assertEqual(solution, self.console.board.values())
+        finally:
+            self.console.execute_command_line('b')
+        self.assertEqual(None, self.console.speculator)
+
+        
+    def test_speculation_skips_stale_states(self):
+        calls = []
+        release = threading.Event()
+        
+        class BlockingSolver(object):
+            def find_move(self, board, allowed_moves):
+                calls.append(board.state_hash)
+                release.wait(10)
+                return (None, None)
+                
+        speculator = console.Speculator([BlockingSolver()])
+        board = sudoku.Board(2, [])
+        speculator.submit(board)
+        deadline = time.time() + 10
+        while not calls and time.time() < deadline:
+            time.sleep(0.01)
+        # The worker is busy with the first state while two more come in
+        board.move([(1, 1, 1)])
+        skipped = board.state_hash
+        speculator.submit(board)
+        board.move([(1, 2, 2)])
+        speculator.submit(board)
+        release.set()
+        self.assertEqual(board.values(), speculator.result(board, console.Speculator.SOLUTION, 10))
+        self.assertNotIn(skipped, calls)
+        self.assertEqual([0, board.state_hash, board.state_hash], calls)
+        speculator.stop()
+        self.assertEqual(None, speculator.result(board, console.Speculator.HINT))
+
     
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import gc
+import sys
+import sudoku
+import memory
+import puzzles
+import unittest
+
+
+class TestFootprint(unittest.TestCase):
+    
+    def test_deep_sizeof(self):
+        shared = [1, 2, 3]
+        self.assertTrue(memory.deep_sizeof([shared, shared]) < memory.deep_sizeof([shared, list(shared)]))
+        self.assertTrue(memory.deep_sizeof([shared], [shared]) < memory.deep_sizeof([shared]))
+        
+        
+    def test_board_budgets(self):
+        for root in (3, 4):
+            footprint = memory.board_footprint(sudoku.Board(root))
+            self.assertTrue(footprint <= memory.BOARD_BUDGETS[root], 
+                "Board(%d) uses %d bytes, budget is %d" % (root, footprint, memory.BOARD_BUDGETS[root]))
+        self.assertEqual({}, memory.over_budget())
+            
+            
+    def test_footprint_report(self):
+        report = memory.footprint_report()
+        self.assertEqual(sorted(sudoku.Dimensions.VALID_ROOTS), sorted(report))
+        self.assertTrue(report[2] < report[3] < report[4])
+        
+        
+    def test_profile_solve(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1), (1, 2, 2), (2, 1, 3), (2, 3, 1), (3, 4, 3), (4, 2, 3), (4, 3, 2), (4, 4, 1)])
+        (steps, peaks) = memory.profile_solve(board)
+        self.assertTrue(board.finished())
+        self.assertEqual(8, len(steps))
+        self.assertIn('BaseSolver', peaks)
+        for (row, col, value, name, peak, allocated) in steps:
+            self.assertEqual(value, board.row(row).cell(col).value)
+            self.assertTrue(0 < peak <= allocated)
+        self.assertTrue(all(peak > 0 for peak in peaks.values()))
+        self.assertEqual(sudoku.ALL_SOLVERS, board.solvers)
+        
+        board = puzzles.board(puzzles.SIMPLE_COLORING)
+        (steps, peaks) = memory.profile_solve(board)
+        expected = puzzles.board(puzzles.SIMPLE_COLORING)
+        self.assertEqual(list(expected.solve_steps()), [step[:4] for step in steps])
+        self.assertIn('SimpleColoringSolver', peaks)
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(None, sys.getprofile())
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import sudoku
+import sat
+import puzzles
+import unittest
+
+
+
+class TestCDCLSolver(unittest.TestCase):
+    
+    def test_luby(self):
+        self.assertEqual([1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8], [sat.luby(i) for i in range(1, 16)])
+        
+        
+    def test_satisfiable(self):
+        clauses = [[1, 2], [-1, 3], [-2, 3], [-3, 4], [-4, -1]]
+        model = sat.CDCLSolver(4, clauses).solve()
+        self.assertNotEqual(None, model)
+        for clause in clauses:
+            self.assertTrue(any((lit in model) if lit > 0 else (-lit not in model) for lit in clause))
+            
+            
+    def test_unsatisfiable(self):
+        self.assertEqual(None, sat.CDCLSolver(1, [[1], [-1]]).solve())
+        # Three pigeons, two holes: variable 2*p + h + 1 means pigeon p in hole h
+        clauses = [[1, 2], [3, 4], [5, 6]]
+        for hole in (1, 2):
+            for p in range(3):
+                for q in range(p + 1, 3):
+                    clauses.append([-(2*p + hole), -(2*q + hole)])
+        solver = sat.CDCLSolver(6, clauses)
+        self.assertEqual(None, solver.solve())
+        self.assertTrue(solver.conflicts > 0)
+        
+        
+        
+class TestSat(unittest.TestCase):
+    
+    def test_encode(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1)])
+        (num_vars, clauses) = sat.encode(board)
+        self.assertEqual(64, num_vars)
+        self.assertIn([sat.variable(4, 0, 1)], clauses)
+        # 16 cells and 12 groups x 4 values, each with one clause and 6 pairs
+        self.assertEqual((16 + 48) * 7 + 1, len(clauses))
+        
+        
+    def test_solve_hard(self):
+        board = puzzles.board(puzzles.INKALA)
+        self.assertTrue(sat.solve(board))
+        self.assertEqual(puzzles.INKALA_SOLUTION, board.dump().replace('\n', ''))
+        
+        
+    def test_solutions(self):
+        board = puzzles.board(puzzles.INKALA)
+        self.assertEqual(1, len(sat.solutions(board, 2)))
+        self.assertEqual(288, len(set(sat.solutions(sudoku.Board(2), None))))
+        
+        
+    def test_no_solution(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1), (2, 3, 2), (3, 4, 1), (4, 2, 2)])
+        self.assertEqual([], sat.solutions(board))
+        self.assertFalse(sat.solve(board))
+        
+        
+    def test_solve_16(self):
+        board = sudoku.Board(4)
+        self.assertTrue(sat.solve(board))
+        self.assertTrue(board.finished())
+        
+        
+    def test_solve_16_hard(self):
+        for puzzle in puzzles.HARD_16:
+            self.assertFalse(puzzles.board(puzzle).solve())
+            board = puzzles.board(puzzle)
+            self.assertEqual(1, len(sat.solutions(board, 2)))
+            self.assertTrue(sat.solve(board))
+            self.assertTrue(board.finished())
+        
+        
+if __name__ == '__main__':
+    unittest.main()
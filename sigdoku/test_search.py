@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import console
+import sudoku
+import search
+import puzzles
+import unittest
+
+
+PUZZLE = puzzles.moves(puzzles.README)
+
+SOLUTION = [puzzles.README_SOLUTION[i:i + 9] for i in range(0, 81, 9)]
+
+
+def dump(size, values):
+    return [''.join(str(v) for v in values[i:i + size]) for i in range(0, size**2, size)]
+
+
+
+class TestSearch(unittest.TestCase):
+    
+    def test_unique(self):
+        board = sudoku.Board()
+        board.move(PUZZLE)
+        values = board.values()
+        solutions = search.Search(board, 2).run()
+        self.assertEqual(1, len(solutions))
+        self.assertEqual(SOLUTION, dump(9, solutions[0]))
+        self.assertEqual(values, board.values())
+        
+        
+    def test_many_solutions(self):
+        board = sudoku.Board()
+        board.move(PUZZLE[4:])
+        solutions = search.Search(board, 2).run()
+        self.assertEqual(2, len(solutions))
+        self.assertNotEqual(solutions[0], solutions[1])
+        
+        
+    def test_all_solutions(self):
+        # There are 288 4x4 sudoku grids
+        board = sudoku.Board(2)
+        table = sudoku.TranspositionTable()
+        solutions = search.Search(board, None, table).run()
+        self.assertEqual(288, len(set(solutions)))
+        self.assertTrue(board.values() == (0,) * 16)
+        
+        
+    def test_no_solution(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1), (2, 3, 2), (3, 4, 1), (4, 2, 2)])
+        self.assertEqual([], search.Search(board).run())
+        
+
+        
+        
+class TestCheckpoint(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'search.json')
+        
+        
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        
+        
+    def test_stop_and_resume(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1)])
+        first = search.Search(board, None, checkpoint_path=self.path)
+        found = first.run(max_nodes=40)
+        self.assertTrue(0 < len(found) < 72)
+        self.assertEqual(1, first.checkpoints)
+        self.assertEqual(((1,) + (0,) * 15), board.values())
+        
+        resumed = search.Search.resume(self.path)
+        self.assertEqual(first.nodes, resumed.nodes)
+        solutions = resumed.run()
+        self.assertEqual(72, len(set(solutions)))
+        self.assertTrue(set(found) <= set(solutions))
+        self.assertEqual(set(solutions), set(search.Search(board, None).run()))
+        
+        
+    def test_periodic(self):
+        board = sudoku.Board()
+        board.move(PUZZLE[4:])
+        solutions = search.Search(board, 3, checkpoint_path=self.path, checkpoint_every=0).run()
+        resumed = search.Search.resume(self.path)
+        self.assertEqual(3, resumed.limit)
+        self.assertTrue(len(resumed.solutions) <= 3)
+        self.assertEqual(set(solutions), set(resumed.run()))
+        
+        
+    def test_console_format(self):
+        board = sudoku.Board()
+        board.move(PUZZLE)
+        search.Search(board, checkpoint_path=self.path, checkpoint_every=0).checkpoint()
+        game = console.Console(3)
+        game.execute_command_line('l ' + self.path)
+        self.assertEqual('', game.error_message)
+        self.assertEqual(board.values(), game.board.values())
+        
+        
+class TestParallelSearch(unittest.TestCase):
+    
+    def test_all_solutions(self):
+        board = sudoku.Board(2)
+        solutions = search.ParallelSearch(board, None, processes=2).run()
+        self.assertEqual(288, len(set(solutions)))
+        
+        
+    def test_unique(self):
+        board = sudoku.Board()
+        board.move(PUZZLE)
+        solutions = search.ParallelSearch(board, 2, processes=2).run()
+        self.assertEqual([SOLUTION], [dump(9, s) for s in solutions])
+        
+        
+    def test_limit(self):
+        board = sudoku.Board()
+        board.move(PUZZLE[6:])
+        solutions = search.ParallelSearch(board, 2, processes=2).run()
+        self.assertEqual(2, len(set(solutions)))
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import random
 import sudoku
 import solvers
+import puzzles
 import unittest
 
 
@@ -236,6 +238,348 @@ class TestBoard(unittest.TestCase):
         """.strip().replace(' ', ''))
         
 
+    def test_state_hash(self):
+        self.assertEqual(0, self.board.state_hash)
+        self.board.move([(1, 3, 4)])
+        h1 = self.board.state_hash
+        self.assertNotEqual(0, h1)
+        self.board.move([(5, 5, 7)])
+        self.assertNotEqual(h1, self.board.state_hash)
+        
+        # The hash depends on the values only, not on the order of the moves
+        other = sudoku.Board()
+        other.move([(5, 5, 7), (1, 3, 4)])
+        self.assertEqual(other.state_hash, self.board.state_hash)
+        
+        self.board.row(5).cell(5).empty()
+        self.assertEqual(h1, self.board.state_hash)
+        self.board.row(1).cell(3).empty()
+        self.assertEqual(0, self.board.state_hash)
+        
+        
+    def test_solve_transpositions(self):
+        moves = puzzles.moves(puzzles.README)
+        table = sudoku.TranspositionTable()
+        self.board.move(moves)
+        self.assertTrue(self.board.solve(table))
+        self.assertEqual(1, len(table))
+        self.assertEqual(0, table.hits)
+        
+        other = sudoku.Board(3, [])
+        other.move(moves)
+        self.assertTrue(other.solve(table))
+        self.assertEqual(1, table.hits)
+        self.assertEqual(self.board.dump(), other.dump())
+        
+        dead = sudoku.Board(3, [])
+        dead.move(moves[:3])
+        table.mark_dead(dead.state_hash)
+        self.assertFalse(dead.solve(table))
+        self.assertEqual(3, len([c for c in dead.cells if c.value]))
+
+
+    def test_reset_load(self):
+        cells = list(self.board.cells)
+        self.board.move([(1, 3, 4), (5, 5, 7)])
+        self.board.reset()
+        self.assertEqual([], self.board.moves)
+        self.assertEqual(0, self.board.state_hash)
+        self.assertTrue(all(cell.is_empty() for cell in self.board.cells))
+        self.assertIn(4, self.board.row(1).cell(5).allowed_moves())
+        
+        self.board.load([(2, 2, 9)])
+        self.assertEqual([(2, 2, 9)], self.board.moves)
+        self.assertEqual(9, self.board.row(2).cell(2).value)
+        self.assertNotIn(9, self.board.row(2).cell(7).allowed_moves())
+        self.assertEqual(cells, self.board.cells)
+        
+        fresh = sudoku.Board()
+        fresh.move([(2, 2, 9)])
+        self.assertEqual(fresh.state_hash, self.board.state_hash)
+        
+        
+    def test_fill(self):
+        listener = TestBoard.MockBoardListener()
+        self.board.move(puzzles.moves(puzzles.README))
+        self.board.add_change_listener(listener)
+        solution = [int(v) for v in puzzles.README_SOLUTION]
+        self.assertFalse(self.board.fill(solution[:40]))
+        self.assertEqual(1, len(listener.change_sets))
+        self.assertTrue(self.board.fill(solution))
+        self.assertEqual(''.join(puzzles.README_SOLUTION), self.board.dump().replace('\n', ''))
+        self.assertEqual(81 - 27, sum(len(changes.placed) for changes in listener.change_sets))
+        
+        
+    def test_slots(self):
+        for obj in (self.board, self.board.cell(1), self.board.row(1), self.board.square(1), self.board.dimensions):
+            self.assertRaises(AttributeError, setattr, obj, 'not_an_attribute', 1)
+
+
+    def test_change_listener(self):
+        listener = TestBoard.MockBoardListener()
+        self.board.add_change_listener(listener)
+        self.board.row(1).cell(1).move(5)
+        self.assertEqual(1, len(listener.change_sets))
+        changes = listener.change_sets[0]
+        self.assertEqual([(self.board.cell(1), 5)], changes.placed)
+        self.assertEqual([], changes.cleared)
+        # 8 cells in the row, 8 in the col, 4 more in the square
+        self.assertEqual(20, len(changes.eliminated))
+        self.assertTrue(all(value == 5 for (cell, value) in changes.eliminated))
+        
+        self.board.row(1).cell(9).move(4)
+        self.board.row(1).cell(1).empty()
+        changes = listener.change_sets[-1]
+        self.assertEqual([(self.board.cell(1), 5)], changes.cleared)
+        self.assertEqual([], changes.eliminated)
+        
+        
+    def test_change_listener_batch(self):
+        listener = TestBoard.MockBoardListener()
+        self.board.add_change_listener(listener, [sudoku.VALUE_PLACED, sudoku.VALUE_CLEARED])
+        self.board.move([(1, 1, 5), (1, 2, 6), (2, 1, 7)])
+        self.assertEqual(1, len(listener.change_sets))
+        self.assertEqual(3, len(listener.change_sets[0].placed))
+        self.assertEqual([], listener.change_sets[0].eliminated)
+        
+        with self.board.batch():
+            self.board.move([(1, 3, 8)])
+            self.board.row(1).cell(3).empty()
+            self.board.row(1).cell(1).empty()
+            self.board.row(1).cell(1).move(9)
+            self.assertEqual(1, len(listener.change_sets))
+        self.assertEqual(2, len(listener.change_sets))
+        changes = listener.change_sets[1]
+        self.assertEqual([(self.board.cell(1), 9)], changes.placed)
+        self.assertEqual([(self.board.cell(1), 5)], changes.cleared)
+
+        # Nothing is delivered if the net change is empty
+        with self.board.batch():
+            self.board.row(9).cell(9).move(1)
+            self.board.row(9).cell(9).empty()
+        self.assertEqual(2, len(listener.change_sets))
+        
+        self.board.remove_change_listener(listener)
+        self.board.row(9).cell(9).move(1)
+        self.assertEqual(2, len(listener.change_sets))
+        
+
+
+    def test_change_listener_net_eliminations(self):
+        listener = TestBoard.MockBoardListener()
+        self.board.move([(1, 1, 5)])
+        self.board.add_change_listener(listener)
+        with self.board.batch():
+            self.board.row(1).cell(1).empty()
+            self.board.row(1).cell(2).move(5)
+        changes = listener.change_sets[-1]
+        # Only the cells of col 2 outside square 1 had 5 and lost it
+        self.assertEqual(set((self.board.row(row).cell(2), 5) for row in range(4, 10)), set(changes.eliminated))
+        
+        # Back to the same state: nothing to report
+        self.board.load([(1, 2, 5)])
+        self.assertEqual(1, len(listener.change_sets))
+        
+        
+    def test_change_listener_reset(self):
+        listener = TestBoard.MockBoardListener()
+        self.board.add_change_listener(listener)
+        self.board.move([(1, 1, 1), (5, 5, 5)])
+        self.board.load([(2, 2, 2), (5, 5, 5)])
+        self.assertEqual(2, len(listener.change_sets))
+        changes = listener.change_sets[-1]
+        self.assertEqual([(self.board.cell(1), 1)], changes.cleared)
+        self.assertEqual([(self.board.row(2).cell(2), 2)], changes.placed)
+        
+        self.board.reset()
+        self.assertEqual(3, len(listener.change_sets))
+        changes = listener.change_sets[-1]
+        self.assertEqual([], changes.placed)
+        self.assertEqual(set([(self.board.row(2).cell(2), 2), (self.board.row(5).cell(5), 5)]), 
+                         set(changes.cleared))
+        self.board.reset()
+        self.assertEqual(3, len(listener.change_sets))
+        
+        
+    class MockBoardListener(object):
+        
+        def __init__(self):
+            self.change_sets = []
+            
+        def board_changed(self, board, changes):
+            self.change_sets.append(changes)
+
+
+    def test_solve_steps(self):
+        moves = puzzles.moves(puzzles.README)
+        self.board.move(moves)
+        steps = self.board.solve_steps()
+        (row, col, value, solver) = next(steps)
+        self.assertEqual(value, self.board.row(row).cell(col).value)
+        self.assertEqual('BaseSolver', solver)
+        self.assertEqual(len(moves) + 1, len(self.board.moves))
+        next(steps)
+        steps.close()
+        self.assertEqual(len(moves) + 2, len(self.board.moves))
+        
+        rest = list(self.board.solve_steps())
+        self.assertEqual(81 - len(moves) - 2, len(rest))
+        self.assertTrue(self.board.finished())
+        self.assertEqual([(r, c, v) for (r, c, v, s) in rest], self.board.moves[len(moves) + 2:])
+        self.assertEqual([], list(self.board.solve_steps()))
+
+
+    def check_candidates(self, board):
+        for cell in board.cells:
+            expected = set()
+            if not cell.value:
+                values = set(c.value for group in (board.row(cell.row), board.col(cell.col), board.square(cell.square)) 
+                             for c in group.cells)
+                expected = board.dimensions.all_moves() - values
+            self.assertEqual(expected, board.candidates(cell))
+            self.assertEqual(expected, cell.allowed_moves())
+        ordered = list(board.cells_by_constraint())
+        self.assertEqual(set(c for c in board.cells if not c.value), set(ordered))
+        self.assertEqual(len(set(ordered)), len(ordered))
+        counts = [len(board.candidates(c)) for c in ordered]
+        self.assertEqual(sorted(counts), counts)
+        if ordered:
+            self.assertEqual(counts[0], len(board.candidates(board.most_constrained_cell())))
+        else:
+            self.assertEqual(None, board.most_constrained_cell())
+        
+        
+    def test_incremental_candidates(self):
+        rnd = random.Random(35)
+        for root in (2, 3):
+            board = sudoku.Board(root)
+            for i in range(300):
+                cell = rnd.choice(board.cells)
+                if cell.value:
+                    cell.empty()
+                elif board.candidates(cell):
+                    cell.move(rnd.choice(sorted(board.candidates(cell))))
+                self.check_candidates(board)
+            board.reset()
+            self.check_candidates(board)
+            
+            
+    def test_most_constrained_cell(self):
+        self.assertEqual(9, len(self.board.candidates(self.board.most_constrained_cell())))
+        for i in range(1, 9):
+            self.board.row(1).cell(i).move(i)
+        self.assertEqual(self.board.row(1).cell(9), self.board.most_constrained_cell())
+        self.board.row(1).cell(9).move(9)
+        self.assertEqual(6, len(self.board.candidates(self.board.most_constrained_cell())))
+        self.board.reset()
+        self.assertEqual(81, len(list(self.board.cells_by_constraint())))
+        # Moving cells while iterating yields each of them once
+        seen = []
+        for cell in self.board.cells_by_constraint():
+            seen.append(cell)
+            if len(seen) < 5:
+                cell.move(len(seen))
+        self.assertEqual((81, 81), (len(seen), len(set(seen))))
+        self.board.reset()
+        
+        board = sudoku.Board(2)
+        board.move(puzzles.moves('1234341221434320'))
+        self.assertEqual(board.row(4).cell(4), board.most_constrained_cell())
+        board.move([(4, 4, 1)])
+        self.assertEqual(None, board.most_constrained_cell())
+        self.assertEqual([], list(board.cells_by_constraint()))
+        
+        
+    def test_candidates_after_clear(self):
+        self.board.move([(1, 1, 5), (9, 2, 5), (2, 2, 3)])
+        self.assertNotIn(5, self.board.candidates(self.board.row(9).cell(1)))
+        self.board.row(1).cell(1).empty()
+        # Still blocked by (9, 2)
+        self.assertNotIn(5, self.board.candidates(self.board.row(9).cell(1)))
+        self.assertIn(5, self.board.candidates(self.board.row(1).cell(3)))
+        self.assertEqual(set(range(1, 10)) - set([3]), self.board.candidates(self.board.row(1).cell(1)))
+
+
+
+class TestFrozenBoard(unittest.TestCase):
+    
+    def test_set_shares_rows(self):
+        empty = sudoku.FrozenBoard()
+        frozen = empty.set(2, 3, 4)
+        self.assertEqual(0, empty.value(2, 3))
+        self.assertEqual(4, frozen.value(2, 3))
+        for r in range(9):
+            if r != 1:
+                self.assertIs(empty.rows[r], frozen.rows[r])
+        self.assertIs(frozen, frozen.set(2, 3, 4))
+        self.assertEqual(empty, frozen.set(2, 3, 0))
+        
+        
+    def test_set_rules(self):
+        frozen = sudoku.FrozenBoard().set(5, 5, 4)
+        self.assertRaises(sudoku.DeniedMoveException, frozen.set, 5, 5, 3)
+        self.assertRaises(sudoku.DeniedMoveException, frozen.set, 5, 9, 4)
+        self.assertRaises(sudoku.DeniedMoveException, frozen.set, 1, 5, 4)
+        self.assertRaises(sudoku.DeniedMoveException, frozen.set, 6, 6, 4)
+        self.assertRaises(sudoku.OutOfRangeException, frozen.set, 10, 1, 1)
+        self.assertRaises(sudoku.OutOfRangeException, frozen.set, 1, 1, 10)
+        frozen.set(7, 6, 4)
+        
+        
+    def test_hash_eq(self):
+        board = sudoku.Board()
+        board.move([(1, 3, 4), (5, 5, 7)])
+        frozen = board.freeze()
+        self.assertEqual(board.state_hash, frozen.state_hash)
+        other = sudoku.FrozenBoard().set(5, 5, 7).set(1, 3, 4)
+        self.assertEqual(frozen.state_hash, other.state_hash)
+        self.assertEqual(frozen, other)
+        self.assertFalse(frozen != other)
+        self.assertEqual(hash(frozen), hash(other))
+        self.assertEqual(1, len(set([frozen, other])))
+        self.assertNotEqual(frozen, other.set(9, 9, 1))
+        self.assertNotEqual(sudoku.FrozenBoard(2), sudoku.FrozenBoard(3))
+        
+        
+    def test_to_from_board(self):
+        frozen = sudoku.FrozenBoard(2, [[1, 2, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]])
+        board = frozen.to_board()
+        self.assertEqual(frozen.values(), board.values())
+        self.assertEqual(frozen.state_hash, board.state_hash)
+        self.assertEqual(frozen, board.freeze())
+        self.assertEqual(board.dump(), frozen.dump())
+        self.assertRaises(sudoku.OutOfRangeException, sudoku.FrozenBoard, 2, [[1, 2, 3]])
+        
+        
+    def test_denied_values(self):
+        empty = [0] * 4
+        # Same value twice in a row, a col and a square
+        for rows in ([[1, 1, 0, 0], empty, empty, empty], 
+                     [[1, 0, 0, 0], empty, [1, 0, 0, 0], empty], 
+                     [[1, 0, 0, 0], [0, 1, 0, 0], empty, empty]):
+            self.assertRaises(sudoku.DeniedMoveException, sudoku.FrozenBoard, 2, rows)
+        self.assertEqual(1, sudoku.FrozenBoard(2, [[1, 0, 0, 0], [0, 0, 1, 0], empty, empty]).value(2, 3))
+        
+
+
+class TestTranspositionTable(unittest.TestCase):
+    
+    def test_bounded(self):
+        table = sudoku.TranspositionTable(2)
+        table.store(1, sudoku.TranspositionTable.STUCK, (0,))
+        table.store(2, sudoku.TranspositionTable.SOLVED, (1,))
+        self.assertEqual((sudoku.TranspositionTable.STUCK, (0,)), table.get(1))
+        table.mark_dead(3)
+        self.assertEqual(2, len(table))
+        # 2 is the least recently used entry
+        self.assertNotIn(2, table)
+        self.assertIn(1, table)
+        self.assertTrue(table.is_dead(3))
+        self.assertFalse(table.is_dead(1))
+        self.assertEqual(None, table.get(2))
+        self.assertEqual(1, table.misses)
+        
+
 
 class TestBaseSolver(unittest.TestCase, CellGroupMixin):
     
@@ -287,6 +631,74 @@ class TestBaseSolver(unittest.TestCase, CellGroupMixin):
         (cell, value) = self.board.find_move()
         self.assertEqual(1, value)
         self.assertEqual(cell, self.board.row(8).cell(2))
+
+    
+    
+class TestLinkGraph(unittest.TestCase):
+    
+    def test_incremental(self):
+        board = sudoku.Board()
+        graph = board.link_graph
+        board.move(puzzles.moves(puzzles.SIMPLE_COLORING))
+        board.row(9).cell(9).empty()
+        board.row(1).cell(4).empty()
+        board.row(1).cell(1).move(1)
+        fresh = solvers.LinkGraph(board)
+        for cell in board.cells:
+            self.assertEqual(fresh.candidates(cell), graph.candidates(cell))
+            self.assertEqual(cell.allowed_moves(), graph.candidates(cell))
+        self.assertEqual(fresh.bivalue_cells, graph.bivalue_cells)
+        for value in board.dimensions.ALL_MOVES:
+            self.assertEqual(set(fresh.strong_links(value)), set(graph.strong_links(value)))
+            
+            
+    def test_strong_links(self):
+        board = sudoku.Board(2)
+        board.move([(1, 1, 1), (2, 3, 1)])
+        links = board.link_graph.strong_links(1)
+        self.assertIn((board.row(3).cell(2), board.row(3).cell(4)), links)
+        self.assertIn((board.row(3).cell(2), board.row(4).cell(2)), links)
+        # Col 2 and square 3 link the same pair of cells
+        self.assertEqual(4, len(set(links)))
+        self.assertEqual(set(), board.link_graph.bivalue_cells)
+        board.move([(1, 2, 2)])
+        self.assertEqual(set([board.row(1).cell(3), board.row(1).cell(4), board.row(2).cell(1), board.row(2).cell(2)]), 
+            board.link_graph.bivalue_cells)
+            
+            
+            
+class TestChainSolvers(unittest.TestCase):
+    
+    BASIC_SOLVERS = [solvers.BaseSolver(), solvers.RowColInSquareSolver(), solvers.CoupleTripletInGroupSolver()]
+    
+    def check_needed(self, solver, puzzle, solution):
+        board = sudoku.Board(3, self.BASIC_SOLVERS)
+        board.move(puzzles.moves(puzzle))
+        self.assertFalse(board.solve())
+        
+        board = sudoku.Board(3, self.BASIC_SOLVERS + [solver])
+        board.move(puzzles.moves(puzzle))
+        self.assertTrue(board.solve())
+        self.assertEqual(solution, board.dump().replace('\n', ''))
+        
+        
+    def test_simple_coloring(self):
+        self.check_needed(solvers.SimpleColoringSolver(), puzzles.SIMPLE_COLORING,
+            '169472358485163792237598614892736541674951823351284976548619237723845169916327485')
+            
+            
+    def test_xy_wing(self):
+        self.check_needed(solvers.XYWingSolver(),
+            '037000000000700002009000300000000160008200047004006005025080000100007000040120806',
+            '437592618861743592259861374592478163618235947374916285925684731186357429743129856')
+            
+            
+    def test_xy_chain(self):
+        self.check_needed(solvers.XYChainSolver(),
+            '000100890010079030870000000002000500090001000046205900030060040700040603600000000',
+            '263154897415879236879326451382697514597481362146235978938762145751948623624513789')
+        self.check_needed(solvers.XYChainSolver(), puzzles.XY_CHAIN,
+            '451687239329415876678392415715239648896541327234768951187923564963154782542876193')
  
  
  
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import sudoku
+import search
+import tables
+import puzzles
+import unittest
+
+
+
+class TestTables(unittest.TestCase):
+    
+    def test_grids_2(self):
+        grids = tables.grids_2()
+        self.assertEqual(288, len(set(tuple(g) for g in grids)))
+        for grid in grids[:10]:
+            board = sudoku.Board(2)
+            board.move(search.value_moves(4, grid))
+            self.assertTrue(board.finished())
+            
+            
+    def test_templates_3(self):
+        templates = tables.templates_3()
+        self.assertEqual(46656, len(set(templates)))
+        self.assertTrue(all(bin(t).count('1') == 9 for t in templates))
+        
+        
+    def test_solve_2(self):
+        board = puzzles.board('1200301000030321')
+        self.assertEqual(1, len(tables.solutions(board, 2)))
+        self.assertTrue(tables.solve(board))
+        self.assertEqual('1234\n3412\n2143\n4321', board.dump())
+        self.assertEqual(288, len(tables.solutions(sudoku.Board(2), None)))
+        self.assertEqual([], tables.solutions(puzzles.board('1000002000010200')))
+        
+        
+    def test_solve_3(self):
+        board = puzzles.board(puzzles.INKALA)
+        self.assertEqual(1, len(tables.solutions(board, 2)))
+        self.assertTrue(tables.solve(board))
+        self.assertEqual(puzzles.INKALA_SOLUTION, board.dump().replace('\n', ''))
+        self.assertEqual(2, len(tables.solutions(puzzles.board(puzzles.INKALA[:40] + '0' * 41), 2)))
+        
+        
+    def test_no_tables_4(self):
+        self.assertRaises(sudoku.OutOfRangeException, tables.solutions, sudoku.Board(4))
+        
+        
+    def test_disk_cache(self):
+        cache_dir = os.path.join(tempfile.mkdtemp(), 'tables')
+        try:
+            tables.clear()
+            grids = tables.grids_2(cache_dir)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, 'grids-2.json')))
+            tables.clear()
+            self.assertEqual(grids, tables.grids_2(cache_dir))
+        finally:
+            tables.clear()
+            shutil.rmtree(os.path.dirname(cache_dir))
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import sudoku
+import verify
+import unittest
+
+
+SOLUTION = [int(v) for v in
+    '168734592725169834493582167349275618816943275572618943951427386284396751637851429']
+
+
+@unittest.skipIf(verify.numpy is None, 'numpy not available')
+class TestVerify(unittest.TestCase):
+    
+    def test_unit_layout(self):
+        dims = sudoku.Dimensions(2)
+        layout = verify.unit_layout(dims)
+        self.assertEqual([0, 1, 2, 3], list(layout[0]))
+        self.assertEqual([1, 5, 9, 13], list(layout[5]))
+        self.assertEqual([10, 11, 14, 15], list(layout[11]))
+        self.assertEqual(('square', 4), verify.describe_unit(dims, 11))
+        board = sudoku.Board(3)
+        for (unit, group) in enumerate(board.all_groups):
+            self.assertEqual([board.cells.index(c) for c in group.cells], list(verify.unit_layout(board.dimensions)[unit]))
+        
+        
+    def test_verify_grids(self):
+        partial = list(SOLUTION)
+        partial[3] = partial[40] = 0
+        swapped = list(SOLUTION)
+        # Two cells of row 1 swapped: their cols and square 1 are wrong
+        swapped[1], swapped[2] = swapped[2], swapped[1]
+        duplicate = [0] * 81
+        duplicate[40] = duplicate[44] = 7
+        out_of_range = list(SOLUTION)
+        out_of_range[80] = 10
+        (status, first_unit) = verify.verify_grids([SOLUTION, partial, swapped, duplicate, [0] * 81, out_of_range])
+        self.assertEqual([verify.COMPLETE, verify.CONSISTENT, verify.INVALID, verify.INVALID, verify.CONSISTENT, verify.INVALID], 
+            list(status))
+        self.assertEqual([-1, -1, 10, 4, -1, 8], list(first_unit))
+        
+        
+    def test_shapes_and_chunks(self):
+        grids = verify.numpy.array([SOLUTION] * 5).reshape(5, 9, 9)
+        grids[3, 0, 0] = grids[3, 0, 1]
+        (status, first_unit) = verify.verify_grids(grids, chunk_size=2)
+        self.assertEqual([2, 2, 2, 0, 2], list(status))
+        self.assertEqual(0, first_unit[3])
+        self.assertRaises(sudoku.OutOfRangeException, verify.verify_grids, [[0] * 80])
+        
+        
+    def test_dtypes_and_empty(self):
+        (status, first_unit) = verify.verify_grids(verify.numpy.zeros((2, 81)))
+        self.assertEqual([verify.CONSISTENT] * 2, list(status))
+        grids = verify.numpy.array([SOLUTION, SOLUTION], dtype=float)
+        grids[1, 80] = 2**40
+        (status, first_unit) = verify.verify_grids(grids)
+        self.assertEqual([verify.COMPLETE, verify.INVALID], list(status))
+        self.assertEqual(8, first_unit[1])
+        grids = verify.numpy.array([SOLUTION], dtype=verify.numpy.int64)
+        grids[0, 0] = 2**32 + 1
+        self.assertEqual([verify.INVALID], list(verify.verify_grids(grids)[0]))
+        grids = verify.numpy.zeros((1, 81))
+        grids[0, 5] = 0.5
+        self.assertRaises(sudoku.OutOfRangeException, verify.verify_grids, grids)
+        (status, first_unit) = verify.verify_grids([])
+        self.assertEqual((0, 0), (len(status), len(first_unit)))
+        self.assertTrue(verify.default_chunk_size(16) < verify.default_chunk_size(9))
+        self.assertTrue(verify.default_chunk_size(16) > 1000)
+        
+        
+    def test_board_values(self):
+        board = sudoku.Board(4)
+        board.move([(1, 1, 16), (5, 9, 3)])
+        (status, first_unit) = verify.verify_grids([board.values()])
+        self.assertEqual(verify.CONSISTENT, status[0])
+        
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import sudoku
+
+
+# Status of a verified grid
+INVALID = 0
+CONSISTENT = 1
+COMPLETE = 2
+
+UNIT_KINDS = ('row', 'col', 'square')
+
+# Memory allowed for the temporary arrays of a chunk of grids
+CHUNK_BYTES = 64 << 20
+
+_LAYOUTS = {}
+
+
+def unit_layout(dimensions):
+    """
+    A (3*size, size) array with the zero-based cell indices of every row, 
+    then every col, then every square of the board
+    """
+    layout = _LAYOUTS.get(dimensions.root)
+    if layout is None:
+        root = dimensions.root
+        size = dimensions.size
+        i = numpy.arange(size)
+        rows = i[:, None]*size + i[None, :]
+        cols = rows.T
+        squares = ((i[:, None] / root)*root + i[None, :] / root)*size + (i[:, None] % root)*root + i[None, :] % root
+        layout = numpy.vstack((rows, cols, squares))
+        _LAYOUTS[dimensions.root] = layout
+    return layout
+    
+    
+def describe_unit(dimensions, unit):
+    """
+    The ('row' | 'col' | 'square', 1-based index) of a unit of unit_layout
+    """
+    return (UNIT_KINDS[unit / dimensions.size], unit % dimensions.size + 1)
+    
+    
+def default_chunk_size(size):
+    """
+    The number of grids of the given size verified at once within CHUNK_BYTES:
+    per grid, int32 cells and units and an int64 counter per unit value
+    """
+    return max(1, CHUNK_BYTES / (3*size*size*4*3 + 3*size*(size + 1)*8))
+    
+    
+def verify_grids(grids, chunk_size=None):
+    """
+    Check many grids at once. grids is an array of shape (n, size, size) or 
+    (n, size*size) with 0 for the empty cells; float values must be whole
+    numbers. Return two arrays of length n: the status of each grid (INVALID,
+    CONSISTENT for a partial grid without conflicts, COMPLETE for a solved 
+    grid) and the index in unit_layout of its first conflicting unit, -1 if
+    there is none. A value out of range makes its row conflicting.
+    The grids are checked chunk_size at a time, by default as many as fit in
+    CHUNK_BYTES
+    """
+    if numpy is None:
+        raise RuntimeError('Grid verification needs the numpy module')
+    grids = numpy.asarray(grids)
+    if not len(grids):
+        return (numpy.empty(0, dtype=numpy.int8), numpy.empty(0, dtype=numpy.int32))
+    if grids.ndim == 3:
+        grids = grids.reshape(grids.shape[0], -1)
+    if grids.ndim != 2:
+        raise sudoku.OutOfRangeException('Not an array of grids: shape %s' % (grids.shape,))
+    if not numpy.issubdtype(grids.dtype, numpy.integer):
+        if not numpy.issubdtype(grids.dtype, numpy.number) or (numpy.floor(grids) != grids).any():
+            raise sudoku.OutOfRangeException('Grid values are not whole numbers')
+    size = int(round(grids.shape[1]**0.5))
+    dimensions = sudoku.Dimensions(int(round(size**0.5)))
+    if size**2 != grids.shape[1] or dimensions.size != size:
+        raise sudoku.OutOfRangeException('Not a grid of a valid size: %d cells' % grids.shape[1])
+    if chunk_size is None:
+        chunk_size = default_chunk_size(size)
+    layout = unit_layout(dimensions)
+    status = numpy.empty(len(grids), dtype=numpy.int8)
+    first_unit = numpy.empty(len(grids), dtype=numpy.int32)
+    for start in range(0, len(grids), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        (status[chunk], first_unit[chunk]) = _verify_chunk(grids[chunk], layout, size)
+    return (status, first_unit)
+    
+    
+def _verify_chunk(grids, layout, size):
+    num_grids = len(grids)
+    num_units = len(layout)
+    # Clipped before the cast, so that no large value wraps into range
+    grids = numpy.clip(grids, -1, size + 1).astype(numpy.int32)
+    out_of_range = (grids < 0) | (grids > size)
+    values = numpy.where(out_of_range, 0, grids)
+    units = values[:, layout]
+    # One counter per (grid, unit, value)
+    num_counters = num_grids*num_units*(size + 1)
+    index_type = numpy.int32 if num_counters < 2**31 else numpy.int64
+    offsets = (numpy.arange(num_grids, dtype=index_type)[:, None, None]*num_units + 
+               numpy.arange(num_units, dtype=index_type)[None, :, None])*(size + 1)
+    counts = numpy.bincount((offsets + units).ravel(), minlength=num_counters)
+    counts = counts.reshape(num_grids, num_units, size + 1)
+    conflicts = (counts[:, :, 1:] > 1).any(axis=2)
+    conflicts[:, :size] |= out_of_range.reshape(num_grids, size, size).any(axis=2)
+    invalid = conflicts.any(axis=1)
+    status = numpy.where(invalid, INVALID, numpy.where((values != 0).all(axis=1), COMPLETE, CONSISTENT))
+    first_unit = numpy.where(invalid, conflicts.argmax(axis=1), -1)
+    return (status, first_unit)